@@ -240,8 +240,7 @@ def render_profiles(section_key: str) -> None:
             "- Example backend command: `python3 main.py`\n"
         )
 
-    remove_profile = None
-    for idx, row in enumerate(st.session_state[profiles_key]):
+    for row in st.session_state[profiles_key]:
         row_id = row["id"]
         col_label, col_file, col_port, col_cmd, col_remove = st.columns([0.15, 0.2, 0.15, 0.4, 0.1])
 
@@ -319,18 +318,47 @@ def render_profiles(section_key: str) -> None:
                 )
 
         with col_remove:
-            if st.button("Remove", key=f"{section_key}-prof-remove-{row_id}"):
-                remove_profile = idx
+            st.button(
+                "Remove",
+                key=f"{section_key}-prof-remove-{row_id}",
+                on_click=remove_profile_row,
+                args=(section_key, row_id),
+            )
 
-    if remove_profile is not None:
-        st.session_state[profiles_key].pop(remove_profile)
-        st.rerun()
+    st.button(
+        "Add run profile",
+        key=f"{section_key}-add-profile",
+        on_click=add_profile_row,
+        args=(section_key,),
+    )
 
-    if st.button("Add run profile", key=f"{section_key}-add-profile"):
-        next_id = st.session_state[next_id_key]
-        st.session_state[profiles_key].append({"id": next_id})
-        st.session_state[next_id_key] = next_id + 1
-        st.rerun()
+
+# Row add/remove happens in button callbacks, which run before the script so
+# the click's own rerun already renders the updated rows.
+def add_profile_row(section_key: str) -> None:
+    next_id_key = f"{section_key}_profile_next_id"
+    next_id = st.session_state[next_id_key]
+    st.session_state[f"{section_key}_profiles"].append({"id": next_id})
+    st.session_state[next_id_key] = next_id + 1
+
+
+def remove_profile_row(section_key: str, row_id: int) -> None:
+    profiles_key = f"{section_key}_profiles"
+    st.session_state[profiles_key] = [
+        row for row in st.session_state[profiles_key] if row["id"] != row_id
+    ]
+
+
+def add_manual_file() -> None:
+    next_id = st.session_state.manual_next_id
+    st.session_state.manual_files.append({"id": next_id, "name": "", "content": ""})
+    st.session_state.manual_next_id = next_id + 1
+
+
+def remove_manual_file(row_id: int) -> None:
+    st.session_state.manual_files = [
+        row for row in st.session_state.manual_files if row["id"] != row_id
+    ]
 
 
 def collect_profiles(section_key: str) -> list[dict]:
@@ -359,13 +387,18 @@ def collect_profiles(section_key: str) -> list[dict]:
     return profiles
 
 
+@st.cache_resource(show_spinner=False)
+def get_logo_b64(path: str) -> str:
+    logo_file = Path(path)
+    if not logo_file.exists():
+        return ""
+    return base64.b64encode(logo_file.read_bytes()).decode("ascii")
+
 
 st.set_page_config(page_title="Agentica Builder", page_icon="🧠", layout="wide")
 
 logo_path = APP_ROOT / "assets" / "logo_agentbuilder.png"
-logo_data = ""
-if logo_path.exists():
-    logo_data = base64.b64encode(logo_path.read_bytes()).decode("ascii")
+logo_data = get_logo_b64(str(logo_path))
 
 st.markdown(
     f"""
@@ -451,8 +484,7 @@ with tab_manual:
         st.session_state.manual_next_id = 0
 
     st.markdown("#### Python files")
-    remove_index = None
-    for idx, row in enumerate(st.session_state.manual_files):
+    for row in st.session_state.manual_files:
         col_name, col_remove = st.columns([0.85, 0.15])
         with col_name:
             st.text_input(
@@ -463,8 +495,12 @@ with tab_manual:
                 placeholder="main.py",
             )
         with col_remove:
-            if st.button("Remove", key=f"manual-remove-{row['id']}"):
-                remove_index = idx
+            st.button(
+                "Remove",
+                key=f"manual-remove-{row['id']}",
+                on_click=remove_manual_file,
+                args=(row["id"],),
+            )
         st.text_area(
             "Content",
             value=row.get("content", ""),
@@ -473,15 +509,7 @@ with tab_manual:
             label_visibility="collapsed",
         )
 
-    if remove_index is not None:
-        st.session_state.manual_files.pop(remove_index)
-        st.rerun()
-
-    if st.button("Add Python file"):
-        next_id = st.session_state.manual_next_id
-        st.session_state.manual_files.append({"id": next_id, "name": "", "content": ""})
-        st.session_state.manual_next_id = next_id + 1
-        st.rerun()
+    st.button("Add Python file", on_click=add_manual_file)
 
     st.markdown("#### Run profiles")
     render_profiles("manual")
@@ -1,4 +1,5 @@
 import json
+import locale
 import os
 import signal
 import subprocess
@@ -7,13 +8,19 @@ import webbrowser
 import socket
 import atexit
 import base64
+import binascii
 import platform
 import shlex
 import threading
 import uuid
 import fnmatch
+import functools
 import hashlib
+import heapq
 import hmac
+import http.client
+import pickle
+import queue
 import zipfile
 import tempfile
 import shutil
@@ -21,14 +28,18 @@ import urllib.request
 import difflib
 import sqlite3
 import re
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from urllib.parse import urlparse
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from dataclasses import dataclass
 from pathlib import Path
+from secrets import token_hex
 
+import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
+from streamlit.errors import StreamlitAPIException
 
 try:
     from cryptography.fernet import Fernet, InvalidToken
@@ -36,6 +47,16 @@ except Exception:
     Fernet = None
     InvalidToken = Exception
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
 
 APP_ROOT = Path(__file__).resolve().parent
 CONFIG_DIR = APP_ROOT / "config"
@@ -57,30 +78,155 @@ REGISTRY_DIR = APP_ROOT / "registry"
 REGISTRY_INDEX_PATH = REGISTRY_DIR / "index.json"
 SNAPSHOT_DIR = Path("logs/agent_snapshots")
 SNAPSHOT_INDEX_PATH = SNAPSHOT_DIR / "index.json"
+SNAPSHOT_BLOB_DIR = SNAPSHOT_DIR / "blobs"
 SECRETS_DB_PATH = CONFIG_DIR / "secrets.db"
 SECRETS_KEY_PATH = CONFIG_DIR / "secret.key"
 BUILDER_PORT = 8610
 BUILDER_STATE_PATH = Path("logs/agent_builder_state.json")
 WEBHOOK_PORT = 8625
-
-
-@dataclass(frozen=True)
+IS_WINDOWS = os.name == "nt" or platform.system() == "Windows"
+IS_POSIX = not IS_WINDOWS
+IS_LINUX = platform.system() == "Linux"
+_VENV_BIN = Path(".venv") / ("Scripts" if IS_WINDOWS else "bin")
+_VENV_PYTHON_SUFFIX = _VENV_BIN / ("python.exe" if IS_WINDOWS else "python")
+_VENV_ACTIVATE_SUFFIX = _VENV_BIN / "activate"
+_VENV_PIP_SUFFIX = _VENV_BIN / ("pip.exe" if IS_WINDOWS else "pip")
+SCHEDULE_TYPES = ("hourly", "daily", "cron")
+EVENT_TYPES = ("file_new", "file_change", "webhook", "github_push")
+FILE_EVENT_TYPES = frozenset({"file_new", "file_change"})
+WEBHOOK_EVENT_TYPES = frozenset({"webhook", "github_push"})
+DEFAULT_WEBHOOK_HEADER = "X-Agentica-Token"
+TRIGGER_POLL_SECONDS = 10
+# Watched folders with no filesystem events are still rescanned this often,
+# in case the OS drops events (network mounts, inotify queue overflow).
+FILE_WATCH_RESCAN_SECONDS = 300
+
+
+@dataclass(frozen=True, slots=True)
 class RunProfile:
     label: str
     command: str
     streamlit_port: int | None = None
 
 
+# compact=True is for the runtime state files the background loops rewrite;
+# config files people may hand-edit stay indented.
+def _dumps(data, compact: bool = False) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if compact:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@st.cache_resource(show_spinner=False)
+def _json_cache_store() -> dict[Path, tuple[int, int, bytes]]:
+    return {}
+
+
+# Parsed JSON files keyed by path and validated by (mtime_ns, size). The store
+# outlives reruns; entries are kept pickled so each caller gets its own copy.
+_JSON_CACHE = _json_cache_store()
+
+# mtimes come from the kernel's coarse clock, so a same-size rewrite within the
+# same tick keeps (mtime_ns, size). Like git's racy index entries, a file read
+# this soon after its last change isn't cached.
+_RACY_MTIME_NS = 2_000_000_000
+
+
+def _cached_json(path: Path, default=None):
+    try:
+        stat = path.stat()
+    except OSError:
+        return default
+    entry = _JSON_CACHE.get(path)
+    if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+        return pickle.loads(entry[2])
+    try:
+        data = _loads(path.read_bytes())
+    except (OSError, ValueError):
+        return default
+    if time.time_ns() - stat.st_mtime_ns >= _RACY_MTIME_NS:
+        _JSON_CACHE[path] = (stat.st_mtime_ns, stat.st_size, pickle.dumps(data))
+    else:
+        _JSON_CACHE.pop(path, None)
+    return data
+
+
+@st.cache_resource(show_spinner=False)
+def _stat_cache_store() -> dict[Path, tuple[int, int, object]]:
+    return {}
+
+
+# Loader results built from a file or folder, validated the same way. Each
+# source path has a single loader.
+_STAT_CACHE = _stat_cache_store()
+
+
+def _stat_cached(path_getter, copy):
+    """Cache a loader's result until its source path's (mtime_ns, size) changes; callers get copy(result)."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper():
+            path = path_getter()
+            try:
+                stat = path.stat()
+            except OSError:
+                return fn()
+            entry = _STAT_CACHE.get(path)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                return copy(entry[2])
+            value = fn()
+            if time.time_ns() - stat.st_mtime_ns >= _RACY_MTIME_NS:
+                _STAT_CACHE[path] = (stat.st_mtime_ns, stat.st_size, value)
+            else:
+                _STAT_CACHE.pop(path, None)
+            return copy(value)
+
+        return wrapper
+
+    return decorator
+
+
+def _invalidate_json(path: Path) -> None:
+    _JSON_CACHE.pop(path, None)
+    _STAT_CACHE.pop(path, None)
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    # Readers on other threads see either the old file or the new one, never
+    # a partial write. The temp name is per thread so concurrent saves of the
+    # same file don't clobber each other's temp file.
+    tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _save_json(path: Path, data, compact: bool = False) -> None:
+    _atomic_write_bytes(path, _dumps(data, compact))
+    _invalidate_json(path)
+
 
 def load_settings() -> dict:
     if not SETTINGS_PATH.exists():
         settings = {"agents_root": str(DEFAULT_AGENTS_ROOT)}
-        SETTINGS_PATH.write_text(json.dumps(settings, indent=2))
+        _save_json(SETTINGS_PATH, settings)
         return settings
-    try:
-        return json.loads(SETTINGS_PATH.read_text())
-    except json.JSONDecodeError:
-        return {}
+    return _cached_json(SETTINGS_PATH, {})
+
+
+def save_settings(data: dict) -> None:
+    _save_json(SETTINGS_PATH, data)
 
 
 def get_agents_root() -> Path:
@@ -98,6 +244,7 @@ def ensure_agents_root(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+@functools.lru_cache(maxsize=256)
 def format_path(path: Path) -> str:
     try:
         rel = path.relative_to(APP_ROOT)
@@ -120,12 +267,10 @@ def serialize_profiles(profiles: dict[str, list[RunProfile]]) -> dict:
     return data
 
 
+@_stat_cached(lambda: AGENT_PROFILES_PATH, lambda profiles: {name: list(items) for name, items in profiles.items()})
 def load_profiles() -> dict[str, list[RunProfile]]:
-    if not AGENT_PROFILES_PATH.exists():
-        return {}
-    try:
-        raw = json.loads(AGENT_PROFILES_PATH.read_text())
-    except json.JSONDecodeError:
+    raw = _cached_json(AGENT_PROFILES_PATH)
+    if raw is None:
         return {}
     profiles: dict[str, list[RunProfile]] = {}
     if not isinstance(raw, dict):
@@ -149,7 +294,7 @@ def load_profiles() -> dict[str, list[RunProfile]]:
 
 
 def save_profiles(profiles: dict[str, list[RunProfile]]) -> None:
-    AGENT_PROFILES_PATH.write_text(json.dumps(serialize_profiles(profiles), indent=2))
+    _save_json(AGENT_PROFILES_PATH, serialize_profiles(profiles))
 
 
 AGENTS_ROOT = get_agents_root()
@@ -162,73 +307,68 @@ _STATE_LOCK = threading.Lock()
 
 def load_state() -> dict:
     with _STATE_LOCK:
-        if not STATE_PATH.exists():
-            return {"processes": []}
-        try:
-            data = json.loads(STATE_PATH.read_text())
-        except json.JSONDecodeError:
-            return {"processes": []}
+        data = _cached_json(STATE_PATH)
         return data if isinstance(data, dict) else {"processes": []}
 
 
 def save_state(state: dict) -> None:
     with _STATE_LOCK:
         STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        STATE_PATH.write_text(json.dumps(state, indent=2))
+        _save_json(STATE_PATH, state, compact=True)
 
 
 def atomic_state_update(update_fn) -> dict:
     """Atomically update state with a function that takes state and returns modified state."""
     with _STATE_LOCK:
-        if not STATE_PATH.exists():
-            state = {"processes": []}
-        else:
-            try:
-                state = json.loads(STATE_PATH.read_text())
-            except json.JSONDecodeError:
-                state = {"processes": []}
+        state = _cached_json(STATE_PATH)
         if not isinstance(state, dict):
             state = {"processes": []}
         state = update_fn(state)
         STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        STATE_PATH.write_text(json.dumps(state, indent=2))
+        _save_json(STATE_PATH, state, compact=True)
         return state
 
 
-def load_triggers() -> dict[str, list[dict]]:
-    if not TRIGGERS_PATH.exists():
-        return {}
-    try:
-        data = json.loads(TRIGGERS_PATH.read_text())
-    except json.JSONDecodeError:
+def load_triggers() -> dict[str, dict[str, dict]]:
+    """Return rules per agent, keyed by rule id."""
+    return _triggers_from_json(_cached_json(TRIGGERS_PATH))
+
+
+def _triggers_from_json(data) -> dict[str, dict[str, dict]]:
+    if not isinstance(data, dict):
         return {}
-    return data if isinstance(data, dict) else {}
+    triggers: dict[str, dict[str, dict]] = {}
+    for agent_name, rules in data.items():
+        # Older files stored each agent's rules as a list.
+        if isinstance(rules, list):
+            rules = {
+                rule.setdefault("id", f"{agent_name}-{idx}"): rule
+                for idx, rule in enumerate(rules)
+                if isinstance(rule, dict)
+            }
+        if isinstance(rules, dict) and rules:
+            triggers[agent_name] = rules
+    return triggers
 
 
-def save_triggers(data: dict[str, list[dict]]) -> None:
-    TRIGGERS_PATH.write_text(json.dumps(data, indent=2))
+def save_triggers(data: dict[str, dict[str, dict]]) -> None:
+    _save_json(TRIGGERS_PATH, data)
 
 
 def load_health_config() -> dict:
-    if not HEALTH_CONFIG_PATH.exists():
-        return {}
-    try:
-        data = json.loads(HEALTH_CONFIG_PATH.read_text())
-    except json.JSONDecodeError:
+    data = _cached_json(HEALTH_CONFIG_PATH)
+    if data is None:
         return {}
     return data if isinstance(data, dict) else {}
 
 
 def save_health_config(data: dict) -> None:
-    HEALTH_CONFIG_PATH.write_text(json.dumps(data, indent=2))
+    _save_json(HEALTH_CONFIG_PATH, data)
 
 
 def load_health_state() -> dict:
-    if not HEALTH_STATE_PATH.exists():
-        return {"profiles": {}}
-    try:
-        data = json.loads(HEALTH_STATE_PATH.read_text())
-    except json.JSONDecodeError:
+    data = _cached_json(HEALTH_STATE_PATH)
+    if data is None:
         return {"profiles": {}}
     if not isinstance(data, dict):
         return {"profiles": {}}
@@ -237,37 +377,23 @@ def load_health_state() -> dict:
 
 
 def save_health_state(data: dict) -> None:
-    HEALTH_STATE_PATH.write_text(json.dumps(data, indent=2))
-
-
-def append_health_log(message: str) -> None:
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    line = f"[{timestamp}] {message}\n"
-    HEALTH_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with HEALTH_LOG_PATH.open("a", encoding="utf-8") as handle:
-        handle.write(line)
+    _save_json(HEALTH_STATE_PATH, data, compact=True)
 
 
 def load_metadata() -> dict:
-    if not METADATA_PATH.exists():
-        return {}
-    try:
-        data = json.loads(METADATA_PATH.read_text())
-    except json.JSONDecodeError:
+    data = _cached_json(METADATA_PATH)
+    if data is None:
         return {}
     return data if isinstance(data, dict) else {}
 
 
 def save_metadata(data: dict) -> None:
-    METADATA_PATH.write_text(json.dumps(data, indent=2))
+    _save_json(METADATA_PATH, data)
 
 
 def load_registry_index() -> dict:
-    if not REGISTRY_INDEX_PATH.exists():
-        return {"bundles": []}
-    try:
-        data = json.loads(REGISTRY_INDEX_PATH.read_text())
-    except json.JSONDecodeError:
+    data = _cached_json(REGISTRY_INDEX_PATH)
+    if data is None:
         return {"bundles": []}
     if not isinstance(data, dict):
         return {"bundles": []}
@@ -277,15 +403,12 @@ def load_registry_index() -> dict:
 
 def save_registry_index(data: dict) -> None:
     REGISTRY_DIR.mkdir(parents=True, exist_ok=True)
-    REGISTRY_INDEX_PATH.write_text(json.dumps(data, indent=2))
+    _save_json(REGISTRY_INDEX_PATH, data)
 
 
 def load_snapshot_index() -> dict:
-    if not SNAPSHOT_INDEX_PATH.exists():
-        return {"agents": {}}
-    try:
-        data = json.loads(SNAPSHOT_INDEX_PATH.read_text())
-    except json.JSONDecodeError:
+    data = _cached_json(SNAPSHOT_INDEX_PATH)
+    if data is None:
         return {"agents": {}}
     if not isinstance(data, dict):
         return {"agents": {}}
@@ -295,7 +418,7 @@ def load_snapshot_index() -> dict:
 
 def save_snapshot_index(data: dict) -> None:
     SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
-    SNAPSHOT_INDEX_PATH.write_text(json.dumps(data, indent=2))
+    _save_json(SNAPSHOT_INDEX_PATH, data)
 
 
 def ensure_secrets_db() -> None:
@@ -391,11 +514,8 @@ def list_secret_keys(agent_name: str) -> list[str]:
 
 
 def load_trigger_state() -> dict:
-    if not TRIGGER_STATE_PATH.exists():
-        return {"last_run": {}, "file_snapshots": {}, "cron_last_minute": {}}
-    try:
-        data = json.loads(TRIGGER_STATE_PATH.read_text())
-    except json.JSONDecodeError:
+    data = _cached_json(TRIGGER_STATE_PATH)
+    if data is None:
         return {"last_run": {}, "file_snapshots": {}, "cron_last_minute": {}}
     if not isinstance(data, dict):
         return {"last_run": {}, "file_snapshots": {}, "cron_last_minute": {}}
@@ -406,21 +526,13 @@ def load_trigger_state() -> dict:
 
 
 def save_trigger_state(data: dict) -> None:
-    TRIGGER_STATE_PATH.write_text(json.dumps(data, indent=2))
-
-
-def append_trigger_log(message: str) -> None:
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    line = f"[{timestamp}] {message}\n"
-    TRIGGER_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with TRIGGER_LOG_PATH.open("a", encoding="utf-8") as handle:
-        handle.write(line)
+    _save_json(TRIGGER_STATE_PATH, data, compact=True)
 
 
 def pid_is_alive(pid: int) -> bool:
     if pid is None:
         return False
-    if platform.system() == "Windows":
+    if IS_WINDOWS:
         try:
             kwargs = {"capture_output": True, "text": True, "timeout": 5}
             if hasattr(subprocess, "CREATE_NO_WINDOW"):
@@ -450,7 +562,7 @@ def pid_is_alive(pid: int) -> bool:
 def pgid_is_alive(pgid: int | None) -> bool:
     if pgid is None:
         return False
-    if platform.system() == "Windows":
+    if IS_WINDOWS:
         return False
     try:
         os.killpg(pgid, 0)
@@ -460,7 +572,7 @@ def pgid_is_alive(pgid: int | None) -> bool:
 
 
 def pid_start_time(pid: int) -> int | None:
-    if platform.system() == "Windows":
+    if IS_WINDOWS:
         return None
     _state, start = read_proc_stat(pid)
     return start
@@ -486,7 +598,7 @@ def read_proc_stat(pid: int) -> tuple[str | None, int | None]:
 
 
 def read_proc_cmdline(pid: int) -> str | None:
-    if platform.system() == "Windows":
+    if IS_WINDOWS:
         return None
     try:
         data = Path(f"/proc/{pid}/cmdline").read_bytes()
@@ -498,7 +610,7 @@ def read_proc_cmdline(pid: int) -> str | None:
 
 
 def read_proc_cwd(pid: int) -> Path | None:
-    if platform.system() == "Windows":
+    if IS_WINDOWS:
         return None
     try:
         return Path(os.readlink(f"/proc/{pid}/cwd"))
@@ -575,7 +687,7 @@ def is_process_running(item: dict) -> bool:
                 return False
         if pid_is_alive(pid):
             return True
-        if platform.system() == "Windows" and port and port_is_open(int(port)):
+        if IS_WINDOWS and port and port_is_open(int(port)):
             return True
         if port and port_matches_item(item, int(port)):
             return True
@@ -598,7 +710,8 @@ def refresh_state(state: dict) -> dict:
     """Refresh state by checking which processes are still running."""
     processes = []
     now = time.time()
-    for item in state.get("processes", []):
+    previous = state.get("processes", [])
+    for item in previous:
         # Give newly started processes a grace period (10 seconds)
         # before checking if they're alive - they may still be initializing
         started_at = item.get("started_at", 0)
@@ -607,35 +720,62 @@ def refresh_state(state: dict) -> dict:
             continue
         if is_process_running(item):
             processes.append(item)
+    # Only ever drops entries, so an unchanged count means nothing to write.
+    changed = len(processes) != len(previous) or "processes" not in state
     state["processes"] = processes
-    save_state(state)
+    if changed:
+        save_state(state)
     return state
 
 
+# A folder's mtime changes when entries are added, removed or renamed. The
+# root is resolved per call rather than read from AGENTS_ROOT: the scheduler and
+# health managers outlive reruns and must follow a root changed in settings.
+@_stat_cached(get_agents_root, list)
 def list_agents() -> list[Path]:
-    agents = []
-    for entry in AGENTS_ROOT.iterdir():
-        if not entry.is_dir():
-            continue
-        if entry.name.startswith("."):
-            continue
-        if entry == APP_ROOT:
+    agents: list[tuple[str, Path]] = []
+    with os.scandir(get_agents_root()) as entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if not entry.is_dir():
+                continue
+            path = Path(entry.path)
+            if path == APP_ROOT:
+                continue
+            agents.append((entry.name.lower(), path))
+    agents.sort()
+    return [path for _, path in agents]
+
+
+_SKIP_DIRS: frozenset[str] = frozenset({".venv", "__pycache__", ".git", ".mypy_cache", ".pytest_cache"})
+_BUNDLE_SKIP_DIRS: frozenset[str] = frozenset({".venv", "__pycache__", ".git"})
+
+
+def _iter_files(root: Path, skip_dirs: frozenset[str]):
+    """Yield (entry, relative path) for each file under root, like os.walk without following links."""
+    stack = [(str(root), "")]
+    while stack:
+        current, prefix = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    rel = os.path.join(prefix, entry.name) if prefix else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in skip_dirs:
+                            stack.append((entry.path, rel))
+                    elif entry.is_file():
+                        yield entry, rel
+        except OSError:
             continue
-        agents.append(entry)
-    return sorted(agents, key=lambda p: p.name.lower())
 
 
 def list_files(agent_path: Path) -> list[Path]:
-    files: list[Path] = []
-    skip_dirs = {".venv", "__pycache__", ".git", ".mypy_cache", ".pytest_cache"}
-    for root, dirs, filenames in os.walk(agent_path):
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        for filename in filenames:
-            if filename.startswith(".env"):
-                continue
-            path = Path(root) / filename
-            if path.is_file():
-                files.append(path)
+    files = [
+        Path(entry.path)
+        for entry, _ in _iter_files(agent_path, _SKIP_DIRS)
+        if not entry.name.startswith(".env")
+    ]
     return sorted(files, key=lambda p: str(p).lower())
 
 
@@ -786,9 +926,7 @@ def rename_agent_secrets(old_name: str, new_name: str) -> None:
 
 
 def venv_python_path(agent_path: Path) -> Path:
-    if platform.system() == "Windows":
-        return agent_path / ".venv" / "Scripts" / "python.exe"
-    return agent_path / ".venv" / "bin" / "python"
+    return agent_path / _VENV_PYTHON_SUFFIX
 
 
 def normalize_streamlit_command(command: str, port: int) -> str:
@@ -809,24 +947,32 @@ def normalize_streamlit_command(command: str, port: int) -> str:
     return command
 
 
+# Command prefix -> interpreter arguments used to run it from the agent's venv.
+WINDOWS_COMMAND_PREFIXES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("streamlit ", ("-m", "streamlit")),
+    ("python3 ", ()),
+    ("python ", ()),
+    ("uvicorn ", ("-m", "uvicorn")),
+)
+
+
+def _split_windows_args(text: str) -> list[str]:
+    # With no quotes to honour, shlex's non-POSIX mode splits on whitespace only.
+    if '"' not in text and "'" not in text:
+        return text.split()
+    return shlex.split(text, posix=False)
+
+
 def build_windows_command(command: str, agent_path: Path) -> tuple[list[str] | None, str | None]:
     venv_python = venv_python_path(agent_path)
     if not venv_python.exists():
         return None, "Missing .venv\\Scripts\\python.exe. Create venv first."
     command = command.strip()
-    if command.startswith("streamlit "):
-        rest = shlex.split(command[len("streamlit "):].strip(), posix=False)
-        return [str(venv_python), "-m", "streamlit", *rest], None
-    if command.startswith("python3 "):
-        rest = shlex.split(command[len("python3 "):].strip(), posix=False)
-        return [str(venv_python), *rest], None
-    if command.startswith("python "):
-        rest = shlex.split(command[len("python "):].strip(), posix=False)
-        return [str(venv_python), *rest], None
-    if command.startswith("uvicorn "):
-        rest = shlex.split(command[len("uvicorn "):].strip(), posix=False)
-        return [str(venv_python), "-m", "uvicorn", *rest], None
-    return shlex.split(command, posix=False), None
+    for prefix, launcher_args in WINDOWS_COMMAND_PREFIXES:
+        if command.startswith(prefix):
+            rest = _split_windows_args(command[len(prefix):])
+            return [str(venv_python), *launcher_args, *rest], None
+    return _split_windows_args(command), None
 
 
 def start_process(agent: str, profile: RunProfile, agent_path: Path) -> dict:
@@ -835,9 +981,10 @@ def start_process(agent: str, profile: RunProfile, agent_path: Path) -> dict:
     log_handle.write(f"[agentica] Launching {profile.label}\n".encode("utf-8"))
     run_env = build_agent_env(agent)
     command_to_run = profile.command.strip()
+    started_at = time.time()
     if profile.streamlit_port and (profile.label == "streamlit" or "streamlit" in command_to_run):
         command_to_run = normalize_streamlit_command(command_to_run, profile.streamlit_port)
-    if os.name == "nt" or platform.system() == "Windows":
+    if IS_WINDOWS:
         command, error = build_windows_command(command_to_run, agent_path)
         if error:
             log_handle.write(f"[agentica] {error}\n".encode("utf-8"))
@@ -851,7 +998,7 @@ def start_process(agent: str, profile: RunProfile, agent_path: Path) -> dict:
                 "streamlit_port": profile.streamlit_port,
                 "cwd": str(agent_path),
                 "log_path": str(log_path),
-                "started_at": time.time(),
+                "started_at": started_at,
             }
         log_handle.write(
             f"[agentica] Command: {' '.join(command)}\n".encode("utf-8")
@@ -890,16 +1037,41 @@ def start_process(agent: str, profile: RunProfile, agent_path: Path) -> dict:
         "streamlit_port": profile.streamlit_port,
         "cwd": str(agent_path),
         "log_path": str(log_path),
-        "started_at": time.time(),
+        "started_at": started_at,
+        "started_at_str": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started_at)),
     }
 
 
+def start_processes(
+    agent: str, profiles: list[RunProfile], agent_path: Path
+) -> list[tuple[RunProfile, dict | None, Exception | None]]:
+    """Launch several profiles concurrently, returning results in profile order."""
+    if len(profiles) <= 1:
+        futures = None
+    else:
+        pool = ThreadPoolExecutor(max_workers=min(len(profiles), 8), thread_name_prefix="launch")
+        futures = [pool.submit(start_process, agent, profile, agent_path) for profile in profiles]
+        pool.shutdown(wait=False)
+    results: list[tuple[RunProfile, dict | None, Exception | None]] = []
+    for idx, profile in enumerate(profiles):
+        try:
+            if futures is None:
+                item = start_process(agent, profile, agent_path)
+            else:
+                item = futures[idx].result()
+        except Exception as exc:
+            results.append((profile, None, exc))
+            continue
+        results.append((profile, item, None))
+    return results
+
+
 def stop_process(pid: int, pgid: int | None) -> bool:
     """Stop a process and return True if successfully stopped."""
     if pid is None:
         return True
     try:
-        if platform.system() == "Windows":
+        if IS_WINDOWS:
             kwargs = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL, "timeout": 10}
             if hasattr(subprocess, "CREATE_NO_WINDOW"):
                 kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
@@ -923,11 +1095,11 @@ def stop_process(pid: int, pgid: int | None) -> bool:
     except ProcessLookupError:
         return True
 
-    for _ in range(25):
+    for _ in range(100):
         alive = pgid_is_alive(pgid) if pgid else pid_is_alive(pid)
         if not alive:
             return True
-        time.sleep(0.2)
+        time.sleep(0.05)
     try:
         if pgid:
             os.killpg(pgid, signal.SIGKILL)
@@ -938,20 +1110,88 @@ def stop_process(pid: int, pgid: int | None) -> bool:
     return not (pgid_is_alive(pgid) if pgid else pid_is_alive(pid))
 
 
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+
 def tail_log(path: Path, max_lines: int = 80) -> str:
     if not path.exists():
         return ""
+    # Read backwards from the end in blocks until enough newlines are in hand,
+    # so only the tail is read and decoded however large the log has grown.
+    # A restart truncating the log mid-read just gives a short read.
+    chunks: list[bytes] = []
+    newlines = 0
     try:
-        content = path.read_text(errors="ignore")
+        with path.open("rb") as handle:
+            pos = handle.seek(0, os.SEEK_END)
+            while pos > 0 and newlines <= max_lines:
+                step = min(_TAIL_BLOCK_SIZE, pos)
+                pos -= step
+                handle.seek(pos)
+                chunk = handle.read(step)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                newlines += chunk.count(b"\n")
     except OSError:
         return ""
-    lines = content.splitlines()
+    lines = b"".join(reversed(chunks)).decode(errors="ignore").splitlines()
     return "\n".join(lines[-max_lines:])
 
 
+def _find_pids_by_port_procfs(port: int) -> list[int] | None:
+    """Resolve port -> pids from /proc on Linux; None means fall back to lsof/fuser."""
+    inodes: set[str] = set()
+    readable = False
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table, encoding="ascii") as handle:
+                readable = True
+                next(handle, None)
+                for line in handle:
+                    fields = line.split()
+                    # local_address is HEXIP:HEXPORT; inode 0 means no owner (TIME_WAIT).
+                    if len(fields) > 9 and int(fields[1].rsplit(":", 1)[1], 16) == port:
+                        if fields[9] != "0":
+                            inodes.add(fields[9])
+        except (OSError, ValueError):
+            continue
+    if not readable:
+        return None
+    if not inodes:
+        return []
+    targets = {f"socket:[{inode}]" for inode in inodes}
+    pids: set[int] = set()
+    denied = False
+    with os.scandir("/proc") as procs:
+        for proc in procs:
+            if not proc.name.isdigit():
+                continue
+            try:
+                with os.scandir(f"{proc.path}/fd") as fds:
+                    for fd in fds:
+                        try:
+                            if os.readlink(fd.path) in targets:
+                                pids.add(int(proc.name))
+                                break
+                        except OSError:
+                            continue
+            except PermissionError:
+                denied = True
+            except OSError:
+                continue
+    if not pids and denied:
+        return None
+    return sorted(pids)
+
+
 def find_pids_by_port(port: int) -> list[int]:
+    if IS_LINUX:
+        found = _find_pids_by_port_procfs(port)
+        if found is not None:
+            return found
     pids: list[int] = []
-    if platform.system() == "Windows":
+    if IS_WINDOWS:
         try:
             result = subprocess.run(
                 ["netstat", "-ano"],
@@ -987,7 +1227,7 @@ def stop_processes_by_port(port: int) -> bool:
         return False
     for pid in pids:
         try:
-            if platform.system() == "Windows":
+            if IS_WINDOWS:
                 kwargs = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
                 if hasattr(subprocess, "CREATE_NO_WINDOW"):
                     kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
@@ -1013,13 +1253,13 @@ def stop_item_process(item: dict) -> tuple[bool, str]:
         stopped = stop_process(pid, pgid)
         if stopped:
             # On Unix systems, give a brief moment for port to be released
-            if platform.system() != "Windows" and port:
+            if IS_POSIX and port:
                 time.sleep(0.3)
             return True, "Stopped."
 
     # Check if still alive after PID-based stop attempt
     # Wait a bit longer on Unix for process cleanup
-    if platform.system() != "Windows":
+    if IS_POSIX:
         time.sleep(0.5)
 
     alive = False
@@ -1048,7 +1288,7 @@ def stop_item_process(item: dict) -> tuple[bool, str]:
             return False, "Process still running."
 
     if not alive and port and (
-        (platform.system() == "Windows" and port_is_open(int(port)))
+        (IS_WINDOWS and port_is_open(int(port)))
         or port_matches_item(item, int(port))
     ):
         return False, "Process still running."
@@ -1097,50 +1337,151 @@ def parse_cron_field(field: str, min_value: int, max_value: int) -> set[int] | N
     return {v for v in values if min_value <= v <= max_value}
 
 
-def cron_matches(expression: str, dt: datetime) -> bool:
+@functools.lru_cache(maxsize=256)
+def _parsed_cron(expression: str) -> tuple[int, ...] | None:
+    """Return one bitmask per cron field (bit n set when value n matches); "*" is all ones."""
     parts = expression.split()
     if len(parts) != 5:
-        return False
+        return None
     minute_vals = parse_cron_field(parts[0], 0, 59)
     hour_vals = parse_cron_field(parts[1], 0, 23)
     day_vals = parse_cron_field(parts[2], 1, 31)
     month_vals = parse_cron_field(parts[3], 1, 12)
     weekday_vals = parse_cron_field(parts[4], 0, 7)
-    if minute_vals is not None and dt.minute not in minute_vals:
-        return False
-    if hour_vals is not None and dt.hour not in hour_vals:
-        return False
-    if day_vals is not None and dt.day not in day_vals:
-        return False
-    if month_vals is not None and dt.month not in month_vals:
+    # 7 is an alias for Sunday; fold it into 0 once here instead of on every match.
+    if weekday_vals and 7 in weekday_vals:
+        weekday_vals = (weekday_vals - {7}) | {0}
+    return tuple(
+        sum(1 << value for value in vals) if vals is not None else -1
+        for vals in (minute_vals, hour_vals, day_vals, month_vals, weekday_vals)
+    )
+
+
+def cron_matches(expression: str, dt: datetime) -> bool:
+    fields = _parsed_cron(expression)
+    if fields is None:
         return False
-    if weekday_vals is not None:
-        if 7 in weekday_vals:
-            weekday_vals = set(weekday_vals)
-            weekday_vals.add(0)
-        cron_weekday = (dt.weekday() + 1) % 7
-        if cron_weekday not in weekday_vals:
-            return False
-    return True
+    minute_mask, hour_mask, day_mask, month_mask, weekday_mask = fields
+    weekday = (dt.weekday() + 1) % 7
+    return bool(
+        (minute_mask >> dt.minute)
+        & (hour_mask >> dt.hour)
+        & (day_mask >> dt.day)
+        & (month_mask >> dt.month)
+        & (weekday_mask >> weekday)
+        & 1
+    )
+
+
+def _next_fire_time(kind: str, slot, after: datetime) -> datetime | None:
+    base = after.replace(second=0, microsecond=0)
+    try:
+        if kind == "hourly":
+            candidate = base.replace(minute=slot)
+            if candidate <= after:
+                candidate += timedelta(hours=1)
+            return candidate
+        if kind == "daily":
+            candidate = base.replace(hour=slot[0], minute=slot[1])
+            if candidate <= after:
+                candidate += timedelta(days=1)
+            return candidate
+    except ValueError:
+        return None
+    if _parsed_cron(slot) is None:
+        return None
+    # Cron: look ahead a day; a rarer expression is re-planned after that.
+    candidate = base + timedelta(minutes=1)
+    for _ in range(24 * 60):
+        if cron_matches(slot, candidate):
+            return candidate
+        candidate += timedelta(minutes=1)
+    return candidate
+
 
+@functools.lru_cache(maxsize=128)
+def _glob_matcher(pattern: str):
+    # Same semantics as fnmatch.fnmatch, compiled once per pattern instead of
+    # normalising and looking it up again for every filename.
+    return re.compile(fnmatch.translate(os.path.normcase(pattern))).match
 
-def scan_files(path: Path, recursive: bool, pattern: str | None) -> set[str]:
+
+def _dir_listing(path: str, listings: dict | None):
+    """Return ([(name, path)] of files, [subdir paths]) for one folder, as os.walk splits them.
+
+    With a listings dict, a folder whose mtime hasn't moved since the last call
+    is served from it without being read again.
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    cached = listings.get(path) if listings is not None else None
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1], cached[2]
+    read_at_ns = time.time_ns()
+    dir_files = []
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                else:
+                    dir_files.append((entry.name, entry.path))
+    except OSError:
+        return None
+    if listings is not None:
+        # An entry added in the same mtime tick as this read wouldn't move the
+        # folder's mtime, so a listing read that soon isn't reused.
+        if read_at_ns - mtime_ns >= _RACY_MTIME_NS:
+            listings[path] = (mtime_ns, dir_files, subdirs)
+        else:
+            listings.pop(path, None)
+    return dir_files, subdirs
+
+
+def scan_files(
+    path: Path, recursive: bool, pattern: str | None, listings: dict | None = None
+) -> set[str]:
     if not path.exists() or not path.is_dir():
         return set()
     files: set[str] = set()
+    matches = _glob_matcher(pattern) if pattern else None
+    normcase = os.path.normcase
     if recursive:
-        for root, _, filenames in os.walk(path):
-            for filename in filenames:
-                if pattern and not fnmatch.fnmatch(filename, pattern):
+        # A folder's mtime only moves when entries are added, removed or renamed
+        # in it, so unchanged folders reuse their listing from the last scan.
+        visited = set()
+        stack = [str(path)]
+        while stack:
+            current = stack.pop()
+            visited.add(current)
+            listing = _dir_listing(current, listings)
+            if listing is None:
+                continue
+            dir_files, subdirs = listing
+            for filename, file_path in dir_files:
+                if matches and not matches(normcase(filename)):
                     continue
-                files.add(str(Path(root) / filename))
+                files.add(file_path)
+            stack.extend(subdirs)
+        if listings is not None:
+            for stale in listings.keys() - visited:
+                del listings[stale]
     else:
-        for entry in path.iterdir():
-            if not entry.is_file():
-                continue
-            if pattern and not fnmatch.fnmatch(entry.name, pattern):
-                continue
-            files.add(str(entry))
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if matches and not matches(normcase(entry.name)):
+                    continue
+                files.add(entry.path)
     return files
 
 
@@ -1148,23 +1489,11 @@ def profile_key(agent_name: str, label: str) -> str:
     return f"{agent_name}::{label}"
 
 
-def http_ping(port: int, timeout: float = 2.0) -> bool:
-    try:
-        conn = socket.create_connection(("127.0.0.1", port), timeout=timeout)
-        conn.settimeout(timeout)
-        conn.sendall(b"GET / HTTP/1.0\r\nHost: localhost\r\n\r\n")
-        conn.recv(1)
-        conn.close()
-        return True
-    except OSError:
-        return False
-
-
 def run_probe_command(agent_path: Path, command: str, timeout: int = 10) -> bool:
     if not command.strip():
         return False
     try:
-        if platform.system() == "Windows":
+        if IS_WINDOWS:
             result = subprocess.run(
                 command,
                 cwd=agent_path,
@@ -1187,32 +1516,6 @@ def run_probe_command(agent_path: Path, command: str, timeout: int = 10) -> bool
         return False
 
 
-def sanitize_env_file(path: Path) -> str:
-    if not path.exists():
-        return ""
-    lines = []
-    for raw in path.read_text(errors="ignore").splitlines():
-        line = raw.rstrip("\n")
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#") or "=" not in line:
-            lines.append(line)
-            continue
-        key, value = line.split("=", 1)
-        key = key.strip()
-        if not key:
-            lines.append(line)
-            continue
-        comment = ""
-        if "#" in value:
-            comment = value[value.index("#") :].strip()
-        placeholder = "YOUR_CREDENTIALS"
-        new_line = f"{key}={placeholder}"
-        if comment:
-            new_line += f" {comment}"
-        lines.append(new_line)
-    return "\n".join(lines) + ("\n" if lines else "")
-
-
 def build_agent_env(agent_name: str) -> dict:
     env = os.environ.copy()
     try:
@@ -1223,7 +1526,7 @@ def build_agent_env(agent_name: str) -> dict:
         value = item.get("value")
         if value:
             env[item["key"]] = value
-    agent_path = AGENTS_ROOT / agent_name
+    agent_path = get_agents_root() / agent_name
     env_path = agent_path / ".env"
     if env_path.exists():
         for row in load_env_file(env_path):
@@ -1276,23 +1579,93 @@ def build_manifest(agent_name: str, agent_path: Path) -> dict:
     }
 
 
+def _latest_snapshot_blobs(agent_name: str) -> tuple[dict[str, dict], float]:
+    """Return the newest snapshot's blob entries by path, and its created_at."""
+    entries = load_snapshot_index()["agents"].get(agent_name, [])
+    if not entries:
+        return {}, 0.0
+    latest = max(entries, key=lambda item: item.get("created_at", 0))
+    try:
+        with zipfile.ZipFile(latest.get("path", ""), "r") as bundle:
+            manifest = json.loads(bundle.read("agentica_snapshot.json"))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return {}, 0.0
+    blobs = {item["path"]: item for item in manifest.get("blobs", [])}
+    return blobs, manifest.get("created_at", 0.0)
+
+
+def _blob_stat_matches(item: dict, stat: os.stat_result, created_at: float) -> bool:
+    # Size and mtime only vouch for the recorded hash when the file was last
+    # modified well before the snapshot was taken; a write landing in the same
+    # mtime tick as the snapshot would otherwise go unnoticed.
+    return (
+        (stat.st_size, stat.st_mtime_ns) == (item.get("size"), item.get("mtime_ns"))
+        and int(created_at * 1_000_000_000) - stat.st_mtime_ns >= _RACY_MTIME_NS
+    )
+
+
+def _file_sha256(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _store_snapshot_blob(path: str) -> str:
+    # Hash the bytes as they are copied, so the blob's name always matches
+    # its content even if the agent rewrites the file mid-snapshot.
+    hasher = hashlib.sha256()
+    tmp_path = SNAPSHOT_BLOB_DIR / f"blob.{threading.get_ident()}.tmp"
+    try:
+        with open(path, "rb") as source, open(tmp_path, "wb") as target:
+            for chunk in iter(lambda: source.read(1 << 20), b""):
+                hasher.update(chunk)
+                target.write(chunk)
+        digest = hasher.hexdigest()
+        blob_path = SNAPSHOT_BLOB_DIR / digest
+        if blob_path.exists():
+            tmp_path.unlink()
+        else:
+            os.replace(tmp_path, blob_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return digest
+
+
 def snapshot_agent(agent_name: str, agent_path: Path, note: str) -> Path:
-    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    SNAPSHOT_BLOB_DIR.mkdir(parents=True, exist_ok=True)
     snapshot_id = f"{agent_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
     snapshot_path = SNAPSHOT_DIR / f"{snapshot_id}.zip"
     manifest = build_manifest(agent_name, agent_path)
     manifest["note"] = note.strip()
     manifest["created_at"] = time.time()
+    # File contents live once in the blob store, keyed by sha256; the snapshot
+    # only records which blob each path had. Files whose size and mtime match
+    # the previous snapshot reuse its hash without being read again.
+    previous, previous_created_at = _latest_snapshot_blobs(agent_name)
+    blobs = []
+    for entry, rel in _iter_files(agent_path, _BUNDLE_SKIP_DIRS):
+        if entry.name.endswith(".pyc"):
+            continue
+        rel = Path(rel).as_posix()
+        stat = entry.stat()
+        prev = previous.get(rel)
+        if (
+            prev
+            and _blob_stat_matches(prev, stat, previous_created_at)
+            and (SNAPSHOT_BLOB_DIR / prev["sha256"]).exists()
+        ):
+            digest = prev["sha256"]
+        else:
+            digest = _store_snapshot_blob(entry.path)
+        blobs.append(
+            {"path": rel, "sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        )
+    manifest["blobs"] = blobs
     with zipfile.ZipFile(snapshot_path, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
-        bundle.writestr("agentica_snapshot.json", json.dumps(manifest, indent=2))
-        for root, dirs, files in os.walk(agent_path):
-            dirs[:] = [d for d in dirs if d not in {".venv", "__pycache__", ".git"}]
-            for filename in files:
-                if filename.endswith(".pyc"):
-                    continue
-                path = Path(root) / filename
-                rel = path.relative_to(agent_path)
-                bundle.write(path, arcname=str(Path("agent") / rel))
+        bundle.writestr("agentica_snapshot.json", _dumps(manifest))
     index = load_snapshot_index()
     index["agents"].setdefault(agent_name, [])
     index["agents"][agent_name].append(
@@ -1308,59 +1681,128 @@ def snapshot_agent(agent_name: str, agent_path: Path, note: str) -> Path:
     return snapshot_path
 
 
-def read_snapshot(snapshot_path: Path) -> dict:
+def read_snapshot_manifest(snapshot_path: Path) -> dict:
+    with zipfile.ZipFile(snapshot_path, "r") as bundle:
+        return json.loads(bundle.read("agentica_snapshot.json"))
+
+
+def _decode_snapshot_text(data: bytes) -> str:
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return ""
+
+
+def iter_snapshot_files(snapshot_path: Path, manifest: dict, skip: set[str] = frozenset()):
+    """Yield (rel, raw bytes) per snapshot file, holding one file in memory at a time."""
     with zipfile.ZipFile(snapshot_path, "r") as bundle:
-        manifest = json.loads(bundle.read("agentica_snapshot.json"))
-        files = {}
         for info in bundle.infolist():
             if not info.filename.startswith("agent/") or info.is_dir():
                 continue
             rel = info.filename[len("agent/") :]
-            try:
-                content = bundle.read(info.filename).decode("utf-8")
-            except UnicodeDecodeError:
-                content = ""
-            files[rel] = content
-    return {"manifest": manifest, "files": files}
-
-
-def diff_snapshot_to_current(agent_path: Path, snapshot: dict) -> str:
-    current_files = {}
-    for root, dirs, files in os.walk(agent_path):
-        dirs[:] = [d for d in dirs if d not in {".venv", "__pycache__", ".git"}]
-        for filename in files:
-            if filename.endswith(".pyc"):
-                continue
-            path = Path(root) / filename
-            rel = str(path.relative_to(agent_path))
-            try:
-                current_files[rel] = path.read_text(errors="ignore")
-            except OSError:
-                current_files[rel] = ""
-    snapshot_files = snapshot.get("files", {})
-    all_files = sorted(set(current_files) | set(snapshot_files))
-    diff_chunks = []
-    for rel in all_files:
-        before = snapshot_files.get(rel, "").splitlines()
-        after = current_files.get(rel, "").splitlines()
-        if before == after:
-            continue
-        diff = difflib.unified_diff(
+            if rel not in skip:
+                yield rel, bundle.read(info.filename)
+    for item in manifest.get("blobs", []):
+        if item["path"] not in skip:
+            blob_path = SNAPSHOT_BLOB_DIR / item["sha256"]
+            yield item["path"], blob_path.read_bytes()
+
+
+def _read_current_bytes(path: str) -> bytes | None:
+    try:
+        return Path(path).read_bytes()
+    except OSError:
+        return None
+
+
+def _decode_current_text(data: bytes | None) -> str:
+    # Same decoding as Path.read_text(errors="ignore").
+    if data is None:
+        return ""
+    return data.decode(locale.getpreferredencoding(False), errors="ignore")
+
+
+def _diff_file(rel: str, before_text: str, after_text: str) -> list[str]:
+    before = before_text.splitlines()
+    after = after_text.splitlines()
+    if before == after:
+        return []
+    return list(
+        difflib.unified_diff(
             before,
             after,
             fromfile=f"snapshot/{rel}",
             tofile=f"current/{rel}",
             lineterm="",
         )
-        diff_chunks.extend(list(diff))
-    return "\n".join(diff_chunks)
+    )
+
+
+def _missing_snapshot_blobs(manifest: dict) -> list[str]:
+    return [
+        item["path"]
+        for item in manifest.get("blobs", [])
+        if not (SNAPSHOT_BLOB_DIR / item["sha256"]).exists()
+    ]
+
+
+def diff_snapshot_to_current(agent_path: Path, snapshot_path: Path) -> tuple[bool, str]:
+    try:
+        manifest = read_snapshot_manifest(snapshot_path)
+    except Exception as exc:
+        return False, f"Failed to read snapshot: {exc}"
+    missing = _missing_snapshot_blobs(manifest)
+    if missing:
+        return False, f"Failed to read snapshot: {len(missing)} file(s) missing from the blob store."
+    current = {}
+    for entry, rel in _iter_files(agent_path, _BUNDLE_SKIP_DIRS):
+        if not entry.name.endswith(".pyc"):
+            current[Path(rel).as_posix()] = entry
+    # Blob-store snapshots record size, mtime and sha256 per file. A file that
+    # still matches size and mtime, or failing that the hash, is the
+    # snapshot's copy, so its blob is never read or decoded.
+    created_at = manifest.get("created_at", 0.0)
+    unchanged = set()
+    for item in manifest.get("blobs", []):
+        entry = current.get(item["path"])
+        if entry is None:
+            continue
+        try:
+            stat = entry.stat()
+            if _blob_stat_matches(item, stat, created_at):
+                unchanged.add(item["path"])
+            elif stat.st_size == item.get("size") and _file_sha256(entry.path) == item["sha256"]:
+                unchanged.add(item["path"])
+        except OSError:
+            continue
+    # Only diff text is kept; file contents are dropped as soon as each file is compared.
+    diffs: dict[str, list[str]] = {}
+    seen = set(unchanged)
+    try:
+        for rel, before in iter_snapshot_files(snapshot_path, manifest, unchanged):
+            seen.add(rel)
+            entry = current.get(rel)
+            after = _read_current_bytes(entry.path) if entry is not None else None
+            # Identical bytes need no decoding or line splitting.
+            if after == before:
+                continue
+            diffs[rel] = _diff_file(rel, _decode_snapshot_text(before), _decode_current_text(after))
+    except (OSError, KeyError, zipfile.BadZipFile) as exc:
+        return False, f"Failed to read snapshot: {exc}"
+    for rel, entry in current.items():
+        if rel not in seen:
+            diffs[rel] = _diff_file(rel, "", _decode_current_text(_read_current_bytes(entry.path)))
+    return True, "\n".join(line for rel in sorted(diffs) for line in diffs[rel])
 
 
 def restore_snapshot(agent_name: str, agent_path: Path, snapshot_path: Path) -> tuple[bool, str]:
     try:
-        snapshot = read_snapshot(snapshot_path)
+        manifest = read_snapshot_manifest(snapshot_path)
     except Exception as exc:
         return False, f"Failed to read snapshot: {exc}"
+    missing = _missing_snapshot_blobs(manifest)
+    if missing:
+        return False, f"Failed to read snapshot: {len(missing)} file(s) missing from the blob store."
     agent_folder = agent_path
     if agent_folder.exists():
         shutil.rmtree(agent_folder)
@@ -1374,7 +1816,10 @@ def restore_snapshot(agent_name: str, agent_path: Path, snapshot_path: Path) ->
             target.parent.mkdir(parents=True, exist_ok=True)
             data = bundle.read(info.filename)
             target.write_bytes(data)
-    manifest = snapshot.get("manifest", {})
+    for item in manifest.get("blobs", []):
+        target = agent_folder / item["path"]
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(SNAPSHOT_BLOB_DIR / item["sha256"], target)
     profiles = load_profiles()
     if manifest.get("profiles"):
         profiles[agent_name] = [
@@ -1408,22 +1853,18 @@ def export_agent_bundle(agent_name: str, agent_path: Path) -> Path:
     manifest = build_manifest(agent_name, agent_path)
     bundle_name = f"{agent_name}_v{manifest['version']}.agentica.zip"
     bundle_path = exports_dir / bundle_name
-    with zipfile.ZipFile(bundle_path, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
-        bundle.writestr("agentica_manifest.json", json.dumps(manifest, indent=2))
+    with zipfile.ZipFile(
+        bundle_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1
+    ) as bundle:
+        bundle.writestr("agentica_manifest.json", _dumps(manifest))
         env_keys = manifest.get("env_keys", [])
         if env_keys:
-            bundle.writestr("agentica_env_keys.json", json.dumps(env_keys, indent=2))
+            bundle.writestr("agentica_env_keys.json", _dumps(env_keys))
             bundle.writestr("env.template", env_template_from_keys(env_keys))
-        for root, dirs, files in os.walk(agent_path):
-            dirs[:] = [d for d in dirs if d not in {".venv", "__pycache__", ".git"}]
-            for filename in files:
-                if filename.endswith(".pyc"):
-                    continue
-                path = Path(root) / filename
-                rel = path.relative_to(agent_path)
-                if rel.name == ".env":
-                    continue
-                bundle.write(path, arcname=str(Path("agent") / rel))
+        for entry, rel in _iter_files(agent_path, _BUNDLE_SKIP_DIRS):
+            if entry.name.endswith(".pyc") or entry.name == ".env":
+                continue
+            bundle.write(entry.path, arcname=os.path.join("agent", rel))
     return bundle_path
 
 
@@ -1504,18 +1945,20 @@ def publish_to_remote_registry(bundle_path: Path, endpoint: str, api_key: str) -
     if not endpoint.strip():
         return False, "Missing registry endpoint."
     try:
-        with open(bundle_path, "rb") as handle:
-            bundle_data = handle.read()
         url = endpoint.rstrip("/") + "/upload"
-        headers = {
-            "X-API-Key": api_key,
-            "Content-Type": "application/zip",
-        }
-        req = urllib.request.Request(url, data=bundle_data, headers=headers, method="POST")
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            if 200 <= resp.status < 300:
-                return True, "Published to remote registry."
-            return False, f"Registry returned {resp.status}."
+        # With an explicit Content-Length, http.client streams the open file
+        # in blocks rather than needing the whole bundle in memory.
+        with open(bundle_path, "rb") as handle:
+            headers = {
+                "X-API-Key": api_key,
+                "Content-Type": "application/zip",
+                "Content-Length": str(os.fstat(handle.fileno()).st_size),
+            }
+            req = urllib.request.Request(url, data=handle, headers=headers, method="POST")
+            with urllib.request.urlopen(req, timeout=20) as resp:
+                if 200 <= resp.status < 300:
+                    return True, "Published to remote registry."
+                return False, f"Registry returned {resp.status}."
     except Exception as exc:
         return False, f"Registry error: {exc}"
 
@@ -1557,24 +2000,29 @@ def publish_to_github_with_credentials(
         return False, f"Git error: {exc}"
     return True, "Published to GitHub."
 def restart_profile_process(agent_name: str, profile: RunProfile, agent_path: Path) -> dict | None:
-    # First, stop and remove the old process atomically
-    state = load_state()
-    stopped = False
-    for item in list(state.get("processes", [])):
-        if item.get("agent") == agent_name and item.get("label") == profile.label:
-            stop_process(item["pid"], item.get("pgid"))
-            stopped = True
-
-    if stopped:
-        # Atomically remove the old process
-        def remove_old_process(s):
-            s["processes"] = [
-                p for p in s.get("processes", [])
-                if not (p.get("agent") == agent_name and p.get("label") == profile.label)
-            ]
-            return s
-        atomic_state_update(remove_old_process)
-        time.sleep(0.3)
+    # First, remove the old process from state in one pass, then stop it
+    to_stop = []
+
+    def remove_old_process(s):
+        surviving = []
+        for p in s.get("processes", []):
+            if p.get("agent") == agent_name and p.get("label") == profile.label:
+                to_stop.append((p.get("pid"), p.get("pgid")))
+            else:
+                surviving.append(p)
+        s["processes"] = surviving
+        return s
+
+    atomic_state_update(remove_old_process)
+    for pid, pgid in to_stop:
+        stop_process(pid, pgid)
+
+    # stop_process has already waited for the exit; only wait (briefly) for
+    # the old listener to release its port.
+    if to_stop and profile.streamlit_port:
+        deadline = time.monotonic() + 0.3
+        while port_is_open(int(profile.streamlit_port)) and time.monotonic() < deadline:
+            time.sleep(0.01)
 
     try:
         item = start_process(agent_name, profile, agent_path)
@@ -1591,16 +2039,82 @@ def restart_profile_process(agent_name: str, profile: RunProfile, agent_path: Pa
     return item
 
 
-class TriggerManager:
-    def __init__(self) -> None:
-        self._lock = threading.Lock()
-        self._stop_event = threading.Event()
-        self._thread: threading.Thread | None = None
-        self._webhook_server: ThreadingHTTPServer | None = None
-        self._webhook_thread: threading.Thread | None = None
-        self._triggers: dict[str, list[dict]] = {}
-        self._triggers_mtime: float = 0.0
-        self._state = load_trigger_state()
+class PooledHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that hands connections to a fixed set of daemon
+    workers instead of starting a new thread for every connection."""
+
+    def __init__(self, server_address, handler_class, workers: int) -> None:
+        super().__init__(server_address, handler_class)
+        self._workers = workers
+        self._requests: queue.SimpleQueue = queue.SimpleQueue()
+        for index in range(workers):
+            threading.Thread(target=self._serve_queue, name=f"webhook-{index}", daemon=True).start()
+
+    def _serve_queue(self) -> None:
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            self.process_request_thread(*item)
+
+    def process_request(self, request, client_address) -> None:
+        self._requests.put((request, client_address))
+
+    def server_close(self) -> None:
+        super().server_close()
+        for _ in range(self._workers):
+            self._requests.put(None)
+
+
+class _FolderWatchHandler:
+    # watchdog only calls dispatch(), so no base class is needed and this
+    # stays importable without watchdog.
+    def __init__(self, mark_dirty, key: tuple[str, bool]) -> None:
+        self._mark_dirty = mark_dirty
+        self._key = key
+
+    def dispatch(self, event) -> None:
+        if event.event_type in ("opened", "closed_no_write"):
+            return
+        self._mark_dirty(self._key)
+
+
+class TriggerManager:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._webhook_server: ThreadingHTTPServer | None = None
+        self._webhook_thread: threading.Thread | None = None
+        self._triggers: dict[str, dict[str, dict]] = {}
+        self._triggers_mtime: float = 0.0
+        self._triggers_digest = b""
+        self._indexed_triggers = None
+        self._schedules: tuple[dict, dict, list] = ({}, {}, [])
+        # Min-heap of (fire time, kind, slot) so the loop can sleep until the
+        # next schedule is due instead of only waking on the poll interval.
+        self._fire_heap: list[tuple[float, str, object]] = []
+        self._state = load_trigger_state()
+        # Folder scans are I/O-bound, so watch rules are scanned concurrently.
+        self._scan_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="trigger-scan")
+        # Webhook-fired triggers start off the request thread. One worker keeps
+        # them in arrival order; _trigger_rule serialises on self._lock anyway.
+        self._dispatch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trigger-dispatch")
+        # Per-rule folder listings reused by recursive scans between ticks.
+        self._dir_listings: dict[str, dict] = {}
+        # In-memory sets mirroring state["file_snapshots"], so file_new rules
+        # don't rebuild a set from the stored list on every tick.
+        self._known_files: dict[str, set[str]] = {}
+        # With watchdog installed, watched folders are only rescanned after a
+        # filesystem event; rules whose last scan found nothing pending are
+        # "settled" until then.
+        self._observer = None
+        self._watches: dict[tuple[str, bool], object] = {}
+        self._dirty_watches: set[tuple[str, bool]] = set()
+        self._watch_lock = threading.Lock()
+        self._settled_rules: dict[str, float] = {}
+        self._log_lock = threading.Lock()
+        self._log_handle = None
 
     def ensure_started(self) -> None:
         if self._thread and self._thread.is_alive():
@@ -1611,11 +2125,30 @@ class TriggerManager:
 
     def stop(self) -> None:
         self._stop_event.set()
+        self._scan_pool.shutdown(wait=False, cancel_futures=True)
+        self._dispatch_pool.shutdown(wait=False, cancel_futures=True)
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
         if self._webhook_server:
             try:
                 self._webhook_server.shutdown()
+                self._webhook_server.server_close()
             except Exception:
                 pass
+        with self._log_lock:
+            if self._log_handle is not None:
+                self._log_handle.close()
+                self._log_handle = None
+
+    def _log(self, message: str) -> None:
+        line = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}\n"
+        with self._log_lock:
+            if self._log_handle is None:
+                TRIGGER_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+                # Line-buffered so each entry is visible to the UI log tail immediately.
+                self._log_handle = TRIGGER_LOG_PATH.open("a", encoding="utf-8", buffering=1)
+            self._log_handle.write(line)
 
     def _start_webhook_server(self) -> None:
         if self._webhook_thread and self._webhook_thread.is_alive():
@@ -1624,28 +2157,58 @@ class TriggerManager:
         manager = self
 
         class WebhookHandler(BaseHTTPRequestHandler):
+            # Keep-alive lets senders reuse a connection for retries and bursts;
+            # idle connections are dropped after the socket timeout.
+            protocol_version = "HTTP/1.1"
+            timeout = 30
+
             def do_POST(self) -> None:
-                length = int(self.headers.get("Content-Length", "0") or "0")
-                body = self.rfile.read(length)
-                path = urlparse(self.path).path
-                status, message = manager.handle_webhook(path, self.headers, body)
+                # Bodies are only framed by Content-Length. Without it, anything
+                # left on the keep-alive socket (e.g. chunked data) would be
+                # parsed as the next request, so don't reuse the connection.
+                length_header = self.headers.get("Content-Length")
+                if length_header is None:
+                    self.close_connection = True
+                if self.headers.get("Transfer-Encoding"):
+                    self.close_connection = True
+                    status, message = 411, "Content-Length required"
+                else:
+                    try:
+                        length = int(length_header or "0")
+                    except ValueError:
+                        length = -1
+                    if length < 0:
+                        self.close_connection = True
+                        status, message = 400, "Invalid Content-Length"
+                    else:
+                        body = self.rfile.read(length)
+                        path = urlparse(self.path).path
+                        status, message = manager.handle_webhook(path, self.headers, body)
+                payload = message.encode("utf-8")
                 self.send_response(status)
                 self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                if self.close_connection:
+                    self.send_header("Connection", "close")
                 self.end_headers()
-                self.wfile.write(message.encode("utf-8"))
+                self.wfile.write(payload)
 
             def log_message(self, format: str, *args) -> None:
                 return
 
         try:
-            server = ThreadingHTTPServer(("0.0.0.0", WEBHOOK_PORT), WebhookHandler)
+            server = PooledHTTPServer(
+                ("0.0.0.0", WEBHOOK_PORT),
+                WebhookHandler,
+                workers=min(32, (os.cpu_count() or 4) * 4),
+            )
         except OSError as exc:
-            append_trigger_log(f"Webhook server failed to start: {exc}")
+            self._log(f"Webhook server failed to start: {exc}")
             return
         self._webhook_server = server
         self._webhook_thread = threading.Thread(target=server.serve_forever, daemon=True)
         self._webhook_thread.start()
-        append_trigger_log(f"Webhook server listening on port {WEBHOOK_PORT}.")
+        self._log(f"Webhook server listening on port {WEBHOOK_PORT}.")
 
     def _reload_triggers_if_needed(self) -> None:
         try:
@@ -1654,125 +2217,258 @@ class TriggerManager:
             mtime = 0.0
         if mtime == self._triggers_mtime:
             return
-        self._triggers = load_triggers()
         self._triggers_mtime = mtime
-
-    def reload_triggers(self) -> None:
-        self._triggers = load_triggers()
         try:
-            self._triggers_mtime = TRIGGERS_PATH.stat().st_mtime
+            raw = TRIGGERS_PATH.read_bytes()
         except OSError:
-            self._triggers_mtime = 0.0
+            raw = b""
+        # Saves rewrite the file (and bump its mtime) even when the rules are
+        # unchanged, so compare content before paying for a parse.
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        if digest == self._triggers_digest:
+            return
+        try:
+            data = _loads(raw) if raw else None
+        except ValueError:
+            data = None
+        self._triggers = _triggers_from_json(data)
+        self._triggers_digest = digest
+        self._settled_rules = {}
+
+    def reload_triggers(self) -> None:
+        self._triggers_mtime = -1.0
+        self._triggers_digest = b""
+        self._reload_triggers_if_needed()
 
     def _run_loop(self) -> None:
-        append_trigger_log("Scheduler loop started.")
+        self._log("Scheduler loop started.")
         while not self._stop_event.is_set():
             try:
                 self._reload_triggers_if_needed()
                 self._check_schedules()
                 self._check_file_triggers()
             except Exception as exc:
-                append_trigger_log(f"Scheduler error: {exc}")
-            self._stop_event.wait(10)
+                self._log(f"Scheduler error: {exc}")
+            self._stop_event.wait(self._next_wait())
+
+    def _next_wait(self) -> float:
+        # File rules and trigger edits still need polling, so never sleep
+        # longer than the poll interval; wake early when a schedule is due.
+        now = time.time()
+        heap = self._fire_heap
+        while heap and heap[0][0] <= now:
+            _, kind, slot = heapq.heappop(heap)
+            next_fire = _next_fire_time(kind, slot, datetime.fromtimestamp(now))
+            if next_fire is not None:
+                heapq.heappush(heap, (next_fire.timestamp(), kind, slot))
+        if not heap:
+            return TRIGGER_POLL_SECONDS
+        return min(TRIGGER_POLL_SECONDS, max(0.0, heap[0][0] - now))
+
+    def _schedule_index(self) -> tuple[dict, dict, list]:
+        # Bucket schedule rules by the minute they fire in, rebuilt only when
+        # the rules are reloaded, so a tick looks at the rules due right now.
+        if self._indexed_triggers is not self._triggers:
+            hourly: dict[int, list] = {}
+            daily: dict[tuple[int, int], list] = {}
+            cron: list = []
+            for agent_name, rules in self._triggers.items():
+                for rule in rules.values():
+                    if not rule.get("enabled", True) or rule.get("kind") != "schedule":
+                        continue
+                    if not rule.get("id"):
+                        continue
+                    schedule_type = rule.get("schedule_type")
+                    try:
+                        if schedule_type == "hourly":
+                            minute = int(rule.get("minute", 0))
+                            hourly.setdefault(minute, []).append((agent_name, rule))
+                        elif schedule_type == "daily":
+                            slot = (int(rule.get("hour", 0)), int(rule.get("minute", 0)))
+                            daily.setdefault(slot, []).append((agent_name, rule))
+                        elif schedule_type == "cron":
+                            expression = rule.get("cron", "").strip()
+                            if expression:
+                                cron.append((agent_name, rule, expression))
+                    except (AttributeError, TypeError, ValueError):
+                        continue
+            self._schedules = (hourly, daily, cron)
+            self._indexed_triggers = self._triggers
+            now = datetime.now()
+            heap = []
+            slots = [("hourly", minute) for minute in hourly]
+            slots += [("daily", slot) for slot in daily]
+            slots += [("cron", expression) for expression in {entry[2] for entry in cron}]
+            for kind, slot in slots:
+                next_fire = _next_fire_time(kind, slot, now)
+                if next_fire is not None:
+                    heap.append((next_fire.timestamp(), kind, slot))
+            heapq.heapify(heap)
+            self._fire_heap = heap
+        return self._schedules
 
     def _check_schedules(self) -> None:
         now = datetime.now()
-        for agent_name, rules in self._triggers.items():
-            for rule in rules:
-                if not rule.get("enabled", True):
-                    continue
-                if rule.get("kind") != "schedule":
-                    continue
-                schedule_type = rule.get("schedule_type")
-                rule_id = rule.get("id")
-                if not rule_id:
+        hourly, daily, cron = self._schedule_index()
+        for agent_name, rule in hourly.get(now.minute, ()):
+            last_run = self._state["last_run"].get(rule["id"])
+            if last_run:
+                last = datetime.fromtimestamp(last_run)
+                if last.hour == now.hour and last.date() == now.date():
                     continue
-                if schedule_type == "hourly":
-                    minute = int(rule.get("minute", 0))
-                    if now.minute != minute:
-                        continue
-                    last_run = self._state["last_run"].get(rule_id)
-                    if last_run and datetime.fromtimestamp(last_run).hour == now.hour and datetime.fromtimestamp(last_run).date() == now.date():
-                        continue
-                    self._trigger_rule(rule, agent_name, "hourly schedule")
-                elif schedule_type == "daily":
-                    minute = int(rule.get("minute", 0))
-                    hour = int(rule.get("hour", 0))
-                    if now.hour != hour or now.minute != minute:
-                        continue
-                    last_run = self._state["last_run"].get(rule_id)
-                    if last_run and datetime.fromtimestamp(last_run).date() == now.date():
-                        continue
-                    self._trigger_rule(rule, agent_name, "daily schedule")
-                elif schedule_type == "cron":
-                    expression = rule.get("cron", "").strip()
-                    if not expression:
-                        continue
-                    minute_key = now.strftime("%Y-%m-%d %H:%M")
-                    if self._state["cron_last_minute"].get(rule_id) == minute_key:
-                        continue
-                    if cron_matches(expression, now):
-                        self._trigger_rule(rule, agent_name, f"cron {expression}")
-                        self._state["cron_last_minute"][rule_id] = minute_key
-                        save_trigger_state(self._state)
+            self._trigger_rule(rule, agent_name, "hourly schedule")
+        for agent_name, rule in daily.get((now.hour, now.minute), ()):
+            last_run = self._state["last_run"].get(rule["id"])
+            if last_run and datetime.fromtimestamp(last_run).date() == now.date():
+                continue
+            self._trigger_rule(rule, agent_name, "daily schedule")
+        if not cron:
+            return
+        minute_key = now.strftime("%Y-%m-%d %H:%M")
+        state_dirty = False
+        for agent_name, rule, expression in cron:
+            rule_id = rule["id"]
+            if self._state["cron_last_minute"].get(rule_id) == minute_key:
+                continue
+            if cron_matches(expression, now):
+                self._trigger_rule(rule, agent_name, f"cron {expression}")
+                self._state["cron_last_minute"][rule_id] = minute_key
+                state_dirty = True
+        if state_dirty:
+            save_trigger_state(self._state)
+
+    def _mark_watch_dirty(self, key: tuple[str, bool]) -> None:
+        with self._watch_lock:
+            self._dirty_watches.add(key)
+
+    def _sync_watches(self, keys: set[tuple[str, bool]]) -> None:
+        for key in set(self._watches) - keys:
+            try:
+                self._observer.unschedule(self._watches.pop(key))
+            except (KeyError, OSError):
+                pass
+        for key in keys - set(self._watches):
+            if self._observer is None:
+                self._observer = Observer()
+                self._observer.daemon = True
+                self._observer.start()
+            try:
+                self._watches[key] = self._observer.schedule(
+                    _FolderWatchHandler(self._mark_watch_dirty, key), key[0], recursive=key[1]
+                )
+            except OSError as exc:
+                # Out of inotify watches or similar: keep polling this folder.
+                self._log(f"Folder watch failed for {key[0]}: {exc}")
 
     def _check_file_triggers(self) -> None:
+        pending = {}
+        listings = {}
+        rules_to_scan = []
         for agent_name, rules in self._triggers.items():
-            for rule in rules:
+            for rule in rules.values():
                 if not rule.get("enabled", True):
                     continue
                 if rule.get("kind") != "event":
                     continue
                 event_type = rule.get("event_type")
-                if event_type not in {"file_new", "file_change"}:
+                if event_type not in FILE_EVENT_TYPES:
                     continue
                 rule_id = rule.get("id")
                 folder = Path(rule.get("path", ""))
                 if not rule_id or not folder.exists():
                     continue
                 recursive = bool(rule.get("recursive", False))
-                pattern = rule.get("pattern") or None
-                snapshot = scan_files(folder, recursive, pattern)
-                prev_snapshot = set(self._state["file_snapshots"].get(rule_id, []))
-                if event_type == "file_new":
-                    if not prev_snapshot:
-                        self._state["file_snapshots"][rule_id] = list(snapshot)
-                        save_trigger_state(self._state)
+                rules_to_scan.append((agent_name, rule, folder, recursive))
+
+        watch_keys = {(str(folder), recursive) for _, _, folder, recursive in rules_to_scan}
+        if Observer is not None and (watch_keys or self._watches):
+            self._sync_watches(watch_keys)
+        with self._watch_lock:
+            dirty_watches, self._dirty_watches = self._dirty_watches, set()
+        now = time.time()
+        settled = {}
+        for agent_name, rule, folder, recursive in rules_to_scan:
+            rule_id = rule["id"]
+            rule_listings = None
+            if recursive:
+                rule_listings = listings[rule_id] = self._dir_listings.get(rule_id, {})
+            key = (str(folder), recursive)
+            settled_at = self._settled_rules.get(rule_id)
+            if (
+                settled_at is not None
+                and key in self._watches
+                and key not in dirty_watches
+                and now - settled_at < FILE_WATCH_RESCAN_SECONDS
+            ):
+                settled[rule_id] = settled_at
+                continue
+            pattern = rule.get("pattern") or None
+            future = self._scan_pool.submit(scan_files, folder, recursive, pattern, rule_listings)
+            pending[future] = (agent_name, rule, folder)
+        self._dir_listings = listings
+        self._settled_rules = settled
+
+        # Only the scans run on the pool; state updates and triggers stay on this thread.
+        state_dirty = False
+        for future in as_completed(pending):
+            agent_name, rule, folder = pending[future]
+            rule_id = rule.get("id")
+            event_type = rule.get("event_type")
+            try:
+                snapshot = future.result()
+            except OSError as exc:
+                self._log(f"File scan failed for {folder}: {exc}")
+                continue
+            if event_type == "file_new":
+                prev_snapshot = self._known_files.get(rule_id)
+                if prev_snapshot is None:
+                    prev_snapshot = set(self._state["file_snapshots"].get(rule_id, []))
+                    self._known_files[rule_id] = prev_snapshot
+                settled[rule_id] = now
+                if not prev_snapshot:
+                    self._state["file_snapshots"][rule_id] = list(snapshot)
+                    self._known_files[rule_id] = snapshot
+                    state_dirty = True
+                    continue
+                if not snapshot <= prev_snapshot:
+                    self._trigger_rule(rule, agent_name, f"new files in {folder}")
+                    self._state["file_snapshots"][rule_id] = list(snapshot)
+                    self._known_files[rule_id] = snapshot
+                    state_dirty = True
+            else:
+                last_scan = self._state["last_run"].get(rule_id, 0)
+                if not last_scan:
+                    self._state["last_run"][rule_id] = time.time()
+                    state_dirty = True
+                    settled[rule_id] = now
+                    continue
+                changed = False
+                for file_path in snapshot:
+                    try:
+                        mtime = os.stat(file_path).st_mtime
+                    except OSError:
                         continue
-                    new_files = snapshot - prev_snapshot
-                    if new_files:
-                        self._trigger_rule(rule, agent_name, f"new files in {folder}")
-                        self._state["file_snapshots"][rule_id] = list(snapshot)
-                        save_trigger_state(self._state)
+                    if mtime > last_scan:
+                        changed = True
+                        break
+                if changed:
+                    self._trigger_rule(rule, agent_name, f"file change in {folder}")
                 else:
-                    last_scan = self._state["last_run"].get(rule_id, 0)
-                    if not last_scan:
-                        self._state["last_run"][rule_id] = time.time()
-                        save_trigger_state(self._state)
-                        continue
-                    changed = False
-                    for file_path in snapshot:
-                        try:
-                            mtime = Path(file_path).stat().st_mtime
-                        except OSError:
-                            continue
-                        if mtime > last_scan:
-                            changed = True
-                            break
-                    if changed:
-                        self._trigger_rule(rule, agent_name, f"file change in {folder}")
+                    settled[rule_id] = now
+        if state_dirty:
+            save_trigger_state(self._state)
 
     def handle_webhook(self, path: str, headers: dict, body: bytes) -> tuple[int, str]:
         self._reload_triggers_if_needed()
         matched = []
         for agent_name, rules in self._triggers.items():
-            for rule in rules:
+            for rule in rules.values():
                 if not rule.get("enabled", True):
                     continue
                 if rule.get("kind") != "event":
                     continue
                 event_type = rule.get("event_type")
-                if event_type not in {"webhook", "github_push"}:
+                if event_type not in WEBHOOK_EVENT_TYPES:
                     continue
                 hook_path = rule.get("webhook_path")
                 if hook_path != path:
@@ -1790,26 +2486,37 @@ class TriggerManager:
                 secret = rule.get("secret")
                 if secret:
                     signature = headers.get("X-Hub-Signature-256") or ""
-                    digest = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
-                    expected = f"sha256={digest}"
-                    if not hmac.compare_digest(signature, expected):
-                        append_trigger_log("GitHub webhook signature mismatch.")
+                    provided = b""
+                    if signature.startswith("sha256="):
+                        try:
+                            provided = binascii.unhexlify(signature[len("sha256="):])
+                        except ValueError:
+                            pass
+                    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).digest()
+                    if not hmac.compare_digest(provided, expected):
+                        self._log("GitHub webhook signature mismatch.")
                         return 401, "Invalid signature."
             else:
                 secret = rule.get("secret")
                 if secret:
-                    header_name = rule.get("secret_header") or "X-Agentica-Token"
+                    header_name = rule.get("secret_header") or DEFAULT_WEBHOOK_HEADER
                     provided = headers.get(header_name, "")
                     if not hmac.compare_digest(provided, secret):
-                        append_trigger_log("Webhook secret mismatch.")
+                        self._log("Webhook secret mismatch.")
                         return 401, "Invalid token."
-            self._trigger_rule(rule, agent_name, f"webhook {path}")
+            self._dispatch_pool.submit(self._dispatch_trigger, rule, agent_name, f"webhook {path}")
         return 200, "OK"
 
+    def _dispatch_trigger(self, rule: dict, agent_name: str, reason: str) -> None:
+        try:
+            self._trigger_rule(rule, agent_name, reason)
+        except Exception as exc:
+            self._log(f"Trigger error for {agent_name}: {exc}")
+
     def _trigger_rule(self, rule: dict, agent_name: str, reason: str) -> None:
         profile_label = rule.get("profile_label")
         if not profile_label:
-            append_trigger_log(f"Trigger skipped for {agent_name}: missing profile label.")
+            self._log(f"Trigger skipped for {agent_name}: missing profile label.")
             return
         with self._lock:
             # Check if already running without calling refresh_state
@@ -1820,7 +2527,7 @@ class TriggerManager:
                     if item.get("agent") == agent_name and item.get("label") == profile_label:
                         # Double-check the process is actually running
                         if is_process_running(item):
-                            append_trigger_log(
+                            self._log(
                                 f"Skipped trigger for {agent_name}:{profile_label} (already running)."
                             )
                             return
@@ -1831,23 +2538,23 @@ class TriggerManager:
                     profile = p
                     break
             if not profile:
-                append_trigger_log(
+                self._log(
                     f"Trigger failed for {agent_name}:{profile_label} (profile not found)."
                 )
                 return
             agent_path = next((p for p in list_agents() if p.name == agent_name), None)
             if not agent_path:
-                append_trigger_log(f"Trigger failed for {agent_name} (agent path not found).")
+                self._log(f"Trigger failed for {agent_name} (agent path not found).")
                 return
             try:
                 item = start_process(agent_name, profile, agent_path)
             except Exception as exc:
-                append_trigger_log(
+                self._log(
                     f"Trigger failed for {agent_name}:{profile_label} ({exc})."
                 )
                 return
             if item.get("pid") is None:
-                append_trigger_log(
+                self._log(
                     f"Trigger failed for {agent_name}:{profile_label} (process not started)."
                 )
                 return
@@ -1861,25 +2568,29 @@ class TriggerManager:
             HEALTH_MANAGER.clear_manual_stop(agent_name, profile_label)
             self._state["last_run"][rule.get("id")] = time.time()
             save_trigger_state(self._state)
-            append_trigger_log(
+            self._log(
                 f"Triggered {agent_name}:{profile_label} via {reason}."
             )
 
     def trigger_now(self, agent_name: str, rule_id: str) -> None:
         self._reload_triggers_if_needed()
-        rule = None
-        for item in self._triggers.get(agent_name, []):
-            if item.get("id") == rule_id:
-                rule = item
-                break
+        rule = self._triggers.get(agent_name, {}).get(rule_id)
         if not rule:
-            append_trigger_log(f"Manual trigger failed: rule {rule_id} not found.")
+            self._log(f"Manual trigger failed: rule {rule_id} not found.")
             return
         self._trigger_rule(rule, agent_name, "manual trigger")
 
 
-TRIGGER_MANAGER = TriggerManager()
-atexit.register(TRIGGER_MANAGER.stop)
+# Streamlit re-executes this module on every rerun; cache_resource keeps one
+# manager (and its threads, pools and webhook socket) per server process.
+@st.cache_resource(show_spinner=False)
+def _trigger_manager() -> TriggerManager:
+    manager = TriggerManager()
+    atexit.register(manager.stop)
+    return manager
+
+
+TRIGGER_MANAGER = _trigger_manager()
 
 
 class HealthManager:
@@ -1887,6 +2598,14 @@ class HealthManager:
         self._lock = threading.Lock()
         self._stop_event = threading.Event()
         self._thread: threading.Thread | None = None
+        # Probes mostly wait on sockets and child processes, so a sweep runs
+        # them together on long-lived workers.
+        self._probe_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="health-probe")
+        # Idle keep-alive connections for HTTP probes, keyed by port.
+        self._probe_conns: dict[int, http.client.HTTPConnection] = {}
+        self._probe_conns_lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._log_handle = None
 
     def ensure_started(self) -> None:
         if self._thread and self._thread.is_alive():
@@ -1896,23 +2615,97 @@ class HealthManager:
 
     def stop(self) -> None:
         self._stop_event.set()
+        self._probe_pool.shutdown(wait=False, cancel_futures=True)
+        with self._probe_conns_lock:
+            for conn in self._probe_conns.values():
+                conn.close()
+            self._probe_conns.clear()
+        with self._log_lock:
+            if self._log_handle is not None:
+                self._log_handle.close()
+                self._log_handle = None
+
+    def _log(self, message: str) -> None:
+        line = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}\n"
+        with self._log_lock:
+            if self._log_handle is None:
+                HEALTH_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+                self._log_handle = HEALTH_LOG_PATH.open("a", encoding="utf-8", buffering=1)
+            self._log_handle.write(line)
 
     def _run_loop(self) -> None:
-        append_health_log("Health loop started.")
+        self._log("Health loop started.")
         while not self._stop_event.is_set():
             try:
                 self._check_health()
             except Exception as exc:
-                append_health_log(f"Health error: {exc}")
+                self._log(f"Health error: {exc}")
             self._stop_event.wait(15)
 
+    def _http_probe(self, port: int, timeout: float = 2.0) -> bool:
+        # Reusing one connection per port avoids a new handshake (and a
+        # TIME_WAIT socket) every sweep. A connection taken from the dict is
+        # used by one probe at a time; if the server dropped it while idle,
+        # retry once on a fresh one.
+        with self._probe_conns_lock:
+            conn = self._probe_conns.pop(port, None)
+        reused = conn is not None
+        while True:
+            if conn is None:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+            try:
+                conn.request("HEAD", "/")
+                response = conn.getresponse()
+                response.read()
+            except OSError:
+                conn.close()
+                if not reused:
+                    return False
+                conn, reused = None, False
+                continue
+            except http.client.HTTPException:
+                # Something answered, just not with HTTP.
+                conn.close()
+                return True
+            if response.will_close:
+                conn.close()
+            else:
+                with self._probe_conns_lock:
+                    stale = self._probe_conns.pop(port, None)
+                    self._probe_conns[port] = conn
+                if stale is not None:
+                    stale.close()
+            return True
+
+    def _run_probes(
+        self, health_config: dict, running_keys: dict, agents_by_name: dict[str, Path]
+    ) -> dict[str, bool]:
+        jobs = {}
+        for key, config in health_config.items():
+            if key not in running_keys:
+                continue
+            probe_type = config.get("probe_type")
+            if probe_type == "http":
+                port = config.get("port")
+                if isinstance(port, int):
+                    jobs[key] = (self._http_probe, port)
+            elif probe_type == "command":
+                agent_path = agents_by_name.get(key.split("::", 1)[0])
+                if agent_path:
+                    jobs[key] = (run_probe_command, agent_path, config.get("probe_command", ""))
+        futures = {key: self._probe_pool.submit(*job) for key, job in jobs.items()}
+        return {key: future.result() for key, future in futures.items()}
+
     def _check_health(self) -> None:
         with self._lock:
             health_config = load_health_config()
             profiles_by_agent = load_profiles()
+            profile_index = {}
+            config_changed = False
             for agent_name, profiles in profiles_by_agent.items():
                 for profile in profiles:
                     key = profile_key(agent_name, profile.label)
+                    profile_index.setdefault(key, profile)
                     if key not in health_config:
                         health_config[key] = {
                             "probe_type": "http" if profile.streamlit_port else "disabled",
@@ -1920,13 +2713,17 @@ class HealthManager:
                             "probe_command": "",
                             "auto_restart": False,
                         }
-            save_health_config(health_config)
+                        config_changed = True
+            if config_changed:
+                save_health_config(health_config)
             health_state = load_health_state()
             state = refresh_state(load_state())
             running = state.get("processes", [])
             running_keys = {
                 profile_key(item["agent"], item["label"]): item for item in running
             }
+            agents_by_name = {p.name: p for p in list_agents()}
+            probe_results = self._run_probes(health_config, running_keys, agents_by_name)
             now = time.time()
 
             for key, config in health_config.items():
@@ -1957,16 +2754,8 @@ class HealthManager:
                     probe_type = config.get("probe_type")
                     if probe_type == "disabled":
                         ok = True
-                    elif probe_type == "http":
-                        port = config.get("port")
-                        if isinstance(port, int):
-                            ok = http_ping(port)
-                        else:
-                            ok = False
-                    elif probe_type == "command":
-                        cmd = config.get("probe_command", "")
-                        agent_path = next((p for p in list_agents() if p.name == agent_name), None)
-                        ok = bool(agent_path) and run_probe_command(agent_path, cmd)
+                    elif probe_type in ("http", "command"):
+                        ok = probe_results.get(key, False)
                     status_entry["status"] = "healthy" if ok else "unhealthy"
                     status_entry["last_check"] = now
                     if ok:
@@ -1976,13 +2765,8 @@ class HealthManager:
                         status_entry["last_failure"] = "health probe failed"
                 else:
                     if status_entry.get("last_pid") and config.get("auto_restart") and not status_entry.get("manual_stop"):
-                        profiles = load_profiles()
-                        profile = None
-                        for p in profiles.get(agent_name, []):
-                            if p.label == label:
-                                profile = p
-                                break
-                        agent_path = next((p for p in list_agents() if p.name == agent_name), None)
+                        profile = profile_index.get(key)
+                        agent_path = agents_by_name.get(agent_name)
                         if profile and agent_path:
                             try:
                                 item = start_process(agent_name, profile, agent_path)
@@ -2003,7 +2787,7 @@ class HealthManager:
                                     status_entry["last_pid"] = item.get("pid")
                                     status_entry["last_check"] = now
                                     status_entry["manual_stop"] = False
-                                    append_health_log(
+                                    self._log(
                                         f"Auto-restarted {agent_name}:{label}."
                                     )
                         else:
@@ -2035,8 +2819,14 @@ class HealthManager:
             save_health_state(state)
 
 
-HEALTH_MANAGER = HealthManager()
-atexit.register(HEALTH_MANAGER.stop)
+@st.cache_resource(show_spinner=False)
+def _health_manager() -> HealthManager:
+    manager = HealthManager()
+    atexit.register(manager.stop)
+    return manager
+
+
+HEALTH_MANAGER = _health_manager()
 
 
 def open_streamlit_tab(port: int) -> None:
@@ -2059,7 +2849,7 @@ def port_is_open(port: int) -> bool:
 
 def launch_builder_app() -> None:
     if not port_is_open(BUILDER_PORT):
-        if platform.system() == "Windows":
+        if IS_WINDOWS:
             process = subprocess.Popen(
                 [
                     "streamlit",
@@ -2102,7 +2892,7 @@ def stop_builder() -> None:
     if not pid:
         return
     try:
-        if platform.system() == "Windows":
+        if IS_WINDOWS:
             subprocess.run(
                 ["taskkill", "/F", "/T", "/PID", str(pid)],
                 stdout=subprocess.DEVNULL,
@@ -2119,18 +2909,11 @@ def stop_builder() -> None:
             pass
 
 
-def ensure_session_default(key: str, value: str) -> None:
-    if key not in st.session_state:
-        st.session_state[key] = value
+PROFILE_EDITOR_COLUMNS = ["type", "file", "port", "label", "command"]
 
 
 def render_profile_editor(section_key: str) -> None:
     profiles_key = f"{section_key}_profiles"
-    next_id_key = f"{section_key}_profile_next_id"
-
-    if profiles_key not in st.session_state:
-        st.session_state[profiles_key] = []
-        st.session_state[next_id_key] = 0
 
     with st.expander("Run profile instructions", expanded=False):
         st.markdown(
@@ -2142,113 +2925,45 @@ def render_profile_editor(section_key: str) -> None:
             "- Example backend command: `python3 main.py`\n"
         )
 
-    remove_profile = None
-    for idx, row in enumerate(st.session_state[profiles_key]):
-        row_id = row["id"]
-        col_label, col_file, col_port, col_cmd, col_remove = st.columns(
-            [0.18, 0.24, 0.12, 0.36, 0.1], vertical_alignment="center"
-        )
-
-        type_key = f"{section_key}-type-{row_id}"
-        label_custom_key = f"{section_key}-label-{row_id}"
-        filename_key = f"{section_key}-file-{row_id}"
-        port_key = f"{section_key}-port-{row_id}"
-        cmd_key = f"{section_key}-cmd-{row_id}"
-
-        with col_label:
-            st.selectbox(
-                "Label",
-                ["streamlit", "backend", "custom"],
-                key=type_key,
-                label_visibility="collapsed",
-            )
-
-        label_type = st.session_state.get(type_key, "streamlit")
-
-        with col_file:
-            st.text_input(
-                "Filename",
-                key=filename_key,
-                label_visibility="collapsed",
-                placeholder="app.py" if label_type == "streamlit" else "main.py",
-            )
-
-        with col_port:
-            if label_type == "streamlit":
-                st.text_input(
-                    "Port",
-                    key=port_key,
-                    label_visibility="collapsed",
-                    placeholder="8510",
-                )
-            else:
-                st.markdown("")
-
-        filename = st.session_state.get(filename_key, "").strip()
-        port_raw = st.session_state.get(port_key, "").strip()
-        port_val = port_raw if port_raw else "8510"
-
-        if label_type == "streamlit":
-            default_cmd = f"streamlit run {filename or 'app.py'} --server.port {port_val} --server.headless true"
-        elif label_type == "backend":
-            default_cmd = f"python3 {filename or 'main.py'}"
-        else:
-            default_cmd = ""
-
-        if label_type in ("streamlit", "backend"):
-            st.session_state[cmd_key] = default_cmd
-        else:
-            ensure_session_default(cmd_key, default_cmd)
-
-        with col_cmd:
-            if label_type == "custom":
-                st.text_input(
-                    "Command",
-                    key=cmd_key,
-                    label_visibility="collapsed",
-                    placeholder="your command here",
-                )
-                st.text_input(
-                    "Custom label",
-                    key=label_custom_key,
-                    label_visibility="collapsed",
-                    placeholder="label",
-                )
-            else:
-                st.text_input(
-                    "Command",
-                    key=cmd_key,
-                    label_visibility="collapsed",
-                    disabled=True,
-                )
-
-        with col_remove:
-            st.markdown('<div class="profile-remove">', unsafe_allow_html=True)
-            if st.button("🗑️", key=f"{section_key}-prof-remove-{row_id}"):
-                remove_profile = idx
-            st.markdown("</div>", unsafe_allow_html=True)
+    # The editor keeps its own edit state under its key, so it is always fed
+    # the same empty frame and the edited rows are mirrored into session_state.
+    edited = st.data_editor(
+        pd.DataFrame(columns=PROFILE_EDITOR_COLUMNS),
+        key=f"{section_key}-profile-editor",
+        num_rows="dynamic",
+        hide_index=True,
+        column_config={
+            "type": st.column_config.SelectboxColumn(
+                "Label", options=["streamlit", "backend", "custom"], default="streamlit", required=True
+            ),
+            "file": st.column_config.TextColumn("Filename", help="app.py for streamlit, main.py for backend"),
+            "port": st.column_config.TextColumn("Port", help="Streamlit only, defaults to 8510"),
+            "label": st.column_config.TextColumn("Custom label", help="Custom profiles only"),
+            "command": st.column_config.TextColumn("Custom command", help="Custom profiles only"),
+        },
+    )
+    st.session_state[profiles_key] = edited.to_dict("records")
+    commands = [profile.command for profile in collect_profile_editor(section_key)]
+    if commands:
+        st.code("\n".join(commands), language="bash")
 
-    if remove_profile is not None:
-        st.session_state[profiles_key].pop(remove_profile)
-        st.rerun()
 
-    if st.button("Add run profile", key=f"{section_key}-add-profile"):
-        next_id = st.session_state[next_id_key]
-        st.session_state[profiles_key].append({"id": next_id})
-        st.session_state[next_id_key] = next_id + 1
-        st.rerun()
+def _editor_text(row: dict, column: str) -> str:
+    value = row.get(column)
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    return str(value).strip()
 
 
 def collect_profile_editor(section_key: str) -> list[RunProfile]:
     profiles_key = f"{section_key}_profiles"
     profiles = []
     for row in st.session_state.get(profiles_key, []):
-        row_id = row["id"]
-        label_type = st.session_state.get(f"{section_key}-type-{row_id}", "streamlit")
-        filename = st.session_state.get(f"{section_key}-file-{row_id}", "").strip()
-        port_raw = st.session_state.get(f"{section_key}-port-{row_id}", "").strip()
-        cmd = st.session_state.get(f"{section_key}-cmd-{row_id}", "").strip()
-        label_custom = st.session_state.get(f"{section_key}-label-{row_id}", "").strip()
+        label_type = _editor_text(row, "type") or "streamlit"
+        filename = _editor_text(row, "file")
+        port_raw = _editor_text(row, "port")
+        cmd = _editor_text(row, "command")
+        label_custom = _editor_text(row, "label")
 
         if label_type == "custom":
             label = label_custom
@@ -2264,22 +2979,228 @@ def collect_profile_editor(section_key: str) -> list[RunProfile]:
             profiles.append(RunProfile("backend", command, None))
     return profiles
 
+
+def rerun_fragment() -> None:
+    # Fragment-scoped reruns are only allowed while the fragment itself is
+    # rerunning; fall back to a full rerun when a full run drew it.
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+
+# Nested fragment: switching the automation type only reruns the form.
+@st.fragment
+def render_add_automation_form(selected_agent: Path, profile_labels: list[str]) -> None:
+    # Automation type selector OUTSIDE form so it triggers re-render
+    rule_kind = st.selectbox("Automation type", ["Schedule", "Event"], key=f"rule-kind-{selected_agent.name}")
+
+    with st.form(f"add-trigger-{selected_agent.name}"):
+        label = st.text_input("Label", value="")
+        profile_choice = st.selectbox("Run profile", profile_labels)
+        enabled = st.checkbox("Enabled", value=True)
+        skip_if_running = st.checkbox("Skip if already running", value=True)
+
+        schedule_type = "hourly"
+        minute = 0
+        hour = 0
+        cron_expr = ""
+        event_type = "file_new"
+        folder_path = ""
+        pattern = "*"
+        recursive = False
+        secret = ""
+        secret_header = DEFAULT_WEBHOOK_HEADER
+
+        if rule_kind == "Schedule":
+            schedule_type = st.selectbox(
+                "Schedule type", SCHEDULE_TYPES
+            )
+            if schedule_type == "hourly":
+                minute = st.number_input("Minute", min_value=0, max_value=59, value=0)
+            elif schedule_type == "daily":
+                hour = st.number_input("Hour", min_value=0, max_value=23, value=9)
+                minute = st.number_input("Minute", min_value=0, max_value=59, value=0)
+            else:
+                cron_expr = st.text_input("Cron (min hour day month weekday)", value="0 * * * *")
+                st.caption("Weekday uses 0=Sunday..6=Saturday (7 also treated as Sunday).")
+        else:
+            event_type = st.selectbox(
+                "Event type", EVENT_TYPES
+            )
+            if event_type in FILE_EVENT_TYPES:
+                folder_path = st.text_input("Folder path", value=str(selected_agent))
+                pattern = st.text_input("Filename pattern", value="*")
+                recursive = st.checkbox("Recursive", value=False)
+            elif event_type == "webhook":
+                secret = st.text_input("Webhook token (optional)", value="")
+                secret_header = st.text_input(
+                    "Token header", value=DEFAULT_WEBHOOK_HEADER
+                )
+            else:
+                secret = st.text_input("GitHub webhook secret (optional)", value="")
+        submitted = st.form_submit_button("Create automation")
+
+    if submitted:
+        rule_id = token_hex(16)
+        rule_label = label.strip() or f"{rule_kind.lower()}-{rule_id[:8]}"
+        base_rule: dict[str, object] = {
+            "id": rule_id,
+            "label": rule_label,
+            "profile_label": profile_choice,
+            "kind": "schedule" if rule_kind == "Schedule" else "event",
+            "enabled": enabled,
+            "skip_if_running": skip_if_running,
+        }
+        if rule_kind == "Schedule":
+            if schedule_type == "hourly":
+                new_rule = {**base_rule, "schedule_type": schedule_type, "minute": int(minute)}
+            elif schedule_type == "daily":
+                new_rule = {
+                    **base_rule,
+                    "schedule_type": schedule_type,
+                    "hour": int(hour),
+                    "minute": int(minute),
+                }
+            else:
+                new_rule = {**base_rule, "schedule_type": schedule_type, "cron": cron_expr.strip()}
+        elif event_type in FILE_EVENT_TYPES:
+            new_rule = {
+                **base_rule,
+                "event_type": event_type,
+                "path": folder_path.strip(),
+                "pattern": pattern.strip() or "*",
+                "recursive": bool(recursive),
+            }
+        else:
+            new_rule = {
+                **base_rule,
+                "event_type": event_type,
+                "webhook_path": f"/hook/{rule_id}",
+                **({"secret": secret.strip()} if secret else {}),
+                **(
+                    {"secret_header": secret_header.strip() or DEFAULT_WEBHOOK_HEADER}
+                    if event_type == "webhook"
+                    else {}
+                ),
+            }
+        triggers_data = _cached_load_triggers(path_mtime_ns(TRIGGERS_PATH))
+        triggers_data.setdefault(selected_agent.name, {})[rule_id] = new_rule
+        save_triggers(triggers_data)
+        st.success("Automation saved.")
+        # Full rerun so the enclosing panel lists the new rule.
+        st.rerun()
+
+
+# Rendered as a fragment so toggling, deleting or adding rules only reruns this
+# panel instead of the whole page.
+@st.fragment
+def render_automation_panel(selected_agent: Path) -> None:
+    with st.container(border=True):
+        st.markdown("#### Schedules & triggers")
+        triggers_data = _cached_load_triggers(path_mtime_ns(TRIGGERS_PATH))
+        agent_rules = triggers_data.get(selected_agent.name, {})
+        trigger_state = _cached_load_trigger_state()
+
+        if not agent_rules:
+            st.info("No schedules or triggers configured for this agent.")
+        else:
+            for rule_id, rule in list(agent_rules.items()):
+                title = rule.get("label") or rule.get("kind", "Automation").title()
+                with st.expander(title, expanded=False):
+                    profile_label = rule.get("profile_label", "unknown")
+                    kind = rule.get("kind", "schedule")
+                    enabled_key = f"trigger-enabled-{rule_id}"
+                    if enabled_key not in st.session_state:
+                        st.session_state[enabled_key] = rule.get("enabled", True)
+                    enabled_val = st.toggle("Enabled", key=enabled_key)
+                    if enabled_val != rule.get("enabled", True):
+                        rule["enabled"] = enabled_val
+                        triggers_data[selected_agent.name] = agent_rules
+                        save_triggers(triggers_data)
+                        TRIGGER_MANAGER.reload_triggers()
+                    st.markdown(f"**Profile:** `{profile_label}` · **Type:** `{kind}`")
+                    if kind == "schedule":
+                        schedule_type = rule.get("schedule_type", "hourly")
+                        if schedule_type == "hourly":
+                            st.markdown(f"Runs hourly at minute `{rule.get('minute', 0)}`.")
+                        elif schedule_type == "daily":
+                            st.markdown(
+                                f"Runs daily at `{rule.get('hour', 0):02d}:{rule.get('minute', 0):02d}`."
+                            )
+                        else:
+                            st.markdown(f"Cron: `{rule.get('cron', '* * * * *')}`")
+                    else:
+                        event_type = rule.get("event_type")
+                        if event_type in FILE_EVENT_TYPES:
+                            st.markdown(
+                                f"Folder: `{rule.get('path', '')}` · Pattern: `{rule.get('pattern', '*')}`"
+                            )
+                            st.markdown(
+                                f"Recursive: `{rule.get('recursive', False)}` · Event: `{event_type}`"
+                            )
+                        else:
+                            hook_path = rule.get("webhook_path", "")
+                            st.markdown(
+                                f"Webhook URL: `http://localhost:{WEBHOOK_PORT}{hook_path}`"
+                            )
+                            if event_type == "github_push":
+                                st.caption("GitHub event: push")
+                    last_run = trigger_state.get("last_run", {}).get(rule_id)
+                    if last_run:
+                        st.markdown(
+                            f"**Last run:** {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(last_run))}"
+                        )
+                    col_run, col_delete = st.columns([0.2, 0.8])
+                    with col_run:
+                        if st.button("Run now", key=f"trigger-run-{rule_id}"):
+                            TRIGGER_MANAGER.trigger_now(selected_agent.name, rule_id)
+                            st.success("Trigger fired.")
+                    with col_delete:
+                        if st.button("Delete", key=f"trigger-delete-{rule_id}"):
+                            agent_rules.pop(rule_id, None)
+                            if not agent_rules:
+                                triggers_data.pop(selected_agent.name, None)
+                            save_triggers(triggers_data)
+                            rerun_fragment()
+
+        st.markdown("#### Add automation")
+        profiles = RUN_PROFILES.get(selected_agent.name, [])
+        profile_labels = [p.label for p in profiles]
+        if not profile_labels:
+            st.warning("Add run profiles before creating schedules or triggers.")
+        else:
+            render_add_automation_form(selected_agent, profile_labels)
+
+        scheduler_log = tail_log_cached(TRIGGER_LOG_PATH, max_lines=120)
+        if scheduler_log is not None:
+            st.markdown("#### Automation log")
+            st.text_area(
+                "Recent scheduler output",
+                value=scheduler_log,
+                height=220,
+            )
+
+
+_ENV_LINE_RE = re.compile(rb"^[ \t\r\f\v]*([^#=\s][^=\n]*)=([^\n]*)$", re.M)
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_env_bytes(path_str: str, mtime_ns: int) -> tuple[tuple[str, str], ...]:
+    data = Path(path_str).read_bytes()
+    return tuple(
+        (match.group(1).decode(errors="ignore").strip(), match.group(2).decode(errors="ignore").rstrip())
+        for match in _ENV_LINE_RE.finditer(data)
+    )
+
+
 def load_env_file(path: Path) -> list[dict]:
-    if not path.exists():
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
         return []
-    rows: list[dict] = []
-    counter = 0
-    for raw in path.read_text(errors="ignore").splitlines():
-        line = raw.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        key, value = line.split("=", 1)
-        key = key.strip()
-        if not key:
-            continue
-        rows.append({"id": counter, "key": key, "value": value})
-        counter += 1
-    return rows
+    pairs = _parse_env_bytes(str(path), mtime_ns)
+    return [{"id": idx, "key": key, "value": value} for idx, (key, value) in enumerate(pairs)]
 
 
 def migrate_env_to_secrets(agent_name: str, env_path: Path) -> int:
@@ -2296,26 +3217,17 @@ def migrate_env_to_secrets(agent_name: str, env_path: Path) -> int:
     return count
 
 
-def write_env_file(path: Path, rows: list[dict]) -> None:
-    content = "\n".join(f"{row['key']}={row['value']}" for row in rows)
-    path.write_text(content + ("\n" if content else ""))
-
-
 def venv_activate_path(agent_path: Path) -> Path:
-    if platform.system() == "Windows":
-        return agent_path / ".venv" / "Scripts" / "activate"
-    return agent_path / ".venv" / "bin" / "activate"
+    return agent_path / _VENV_ACTIVATE_SUFFIX
 
 
 def venv_pip_path(agent_path: Path) -> Path:
-    if platform.system() == "Windows":
-        return agent_path / ".venv" / "Scripts" / "pip.exe"
-    return agent_path / ".venv" / "bin" / "pip"
+    return agent_path / _VENV_PIP_SUFFIX
 
 
 def create_venv(agent_path: Path) -> tuple[bool, str]:
     try:
-        python_cmd = "python" if platform.system() == "Windows" else "python3"
+        python_cmd = "python" if IS_WINDOWS else "python3"
         result = subprocess.run(
             [python_cmd, "-m", "venv", ".venv"],
             cwd=agent_path,
@@ -2333,244 +3245,95 @@ def install_requirements(agent_path: Path) -> tuple[bool, str]:
     pip_path = venv_pip_path(agent_path)
     if not pip_path.exists():
         return False, "pip not found in .venv. Create the virtualenv first."
-    try:
+    # pip can print megabytes; let it write straight to temp files instead of
+    # draining pipes from Python while it runs.
+    with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
         result = subprocess.run(
             [str(pip_path), "install", "-r", "requirements.txt"],
             cwd=agent_path,
-            capture_output=True,
-            text=True,
-            check=True,
+            stdout=stdout_file,
+            stderr=stderr_file,
         )
-    except subprocess.CalledProcessError as exc:
-        output = (exc.stdout or "") + (exc.stderr or "")
-        return False, output.strip() or "Failed to install requirements."
-    return True, result.stdout.strip() or "Requirements installed."
+        stdout_file.seek(0)
+        stdout = stdout_file.read().decode(errors="replace")
+        if result.returncode != 0:
+            stderr_file.seek(0)
+            output = stdout + stderr_file.read().decode(errors="replace")
+            return False, output.strip() or "Failed to install requirements."
+    return True, stdout.strip() or "Requirements installed."
 
 
-st.set_page_config(page_title="Agentica", page_icon="🤖", layout="wide")
-ensure_secrets_db()
-TRIGGER_MANAGER.ensure_started()
-HEALTH_MANAGER.ensure_started()
+def path_mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+# File listings are keyed on the agent folder's mtime so adding or removing
+# entries invalidates them; the TTL bounds staleness for nested changes.
+@st.cache_data(ttl=5, show_spinner=False)
+def _cached_list_files(agent_path: str, mtime_ns: int) -> list[Path]:
+    return list_files(Path(agent_path))
+
+
+# Keyed on the file mtime so any write (UI or elsewhere) invalidates the entry.
+@st.cache_data(max_entries=4, show_spinner=False)
+def _cached_load_triggers(mtime_ns: int) -> dict[str, dict[str, dict]]:
+    return load_triggers()
+
 
-st.markdown(
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached_tail_log(path: str, mtime_ns: int, size: int, max_lines: int) -> str:
+    return tail_log(Path(path), max_lines=max_lines)
+
+
+def tail_log_cached(path: Path, max_lines: int = 80) -> str | None:
+    """tail_log, reused across reruns until the file's mtime or size changes.
+
+    Returns None when the file does not exist, so callers need no separate
+    exists() probe.
     """
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Space+Grotesk:wght@400;500;600;700&family=DM+Mono:wght@400;500&display=swap');
-    :root {
-        --bg-1: #0f1317;
-        --bg-2: #161b22;
-        --card: #1d232c;
-	--card-2: #242b35;
-        --text: #f2f5f7;
-        --muted: #9aa4b2;
-        --accent: #f6c36c;
-        --accent-2: #7dd3fc;
-        --border: rgba(255,255,255,0.08);
-    }
-    html, body, [class*="stApp"] {
-        font-family: "Space Grotesk", sans-serif;
-        background: radial-gradient(circle at top left, rgba(246,195,108,0.18), transparent 40%),
-                    radial-gradient(circle at 30% 20%, rgba(125,211,252,0.16), transparent 45%),
-                    linear-gradient(135deg, var(--bg-1), var(--bg-2));
-        color: var(--text);
-    }
-    .stApp {
-        background: transparent;
-    }
-    .app-hero {
-        background: linear-gradient(120deg, rgba(246,195,108,0.12), rgba(125,211,252,0.12));
-        border: 1px solid var(--border);
-        border-radius: 18px;
-        padding: 28px 28px 18px 28px;
-        margin-bottom: 18px;
-        animation: floatIn 0.8s ease;
-    }
-    .hero-logo {
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        margin-bottom: 12px;
-    }
-    .hero-logo img {
-        height: 160px;
-    }
-    .hero-subtitle {
-        text-align: left;
-        margin: 0;
-    }
-    .app-hero h1 {
-        margin: 0 0 6px 0;
-        font-size: 2.2rem;
-        font-weight: 700;
-        letter-spacing: -0.02em;
-    }
-    .app-hero p {
-        margin: 0;
-        color: var(--muted);
-        font-size: 1rem;
-    }
-    .card {
-        background: var(--card);
-        border: 1px solid var(--border);
-        border-radius: 16px;
-        padding: 18px;
-        animation: floatIn 0.7s ease;
-    }
-    .tag {
-        display: inline-block;
-        padding: 4px 10px;
-        border-radius: 999px;
-        background: rgba(246,195,108,0.14);
-        color: var(--accent);
-        font-size: 0.78rem;
-        font-weight: 600;
-        letter-spacing: 0.04em;
-        text-transform: uppercase;
-    }
-    .muted {
-        color: var(--muted);
-        font-size: 0.9rem;
-    }
-    .file-path {
-        font-family: "DM Mono", monospace;
-        font-size: 0.85rem;
-        color: var(--accent-2);
-    }
-    .stButton>button {
-        background: var(--accent);
-        color: #1a1a1a;
-        border: none;
-        border-radius: 10px;
-        font-weight: 600;
-        padding: 0.6rem 1.1rem;
-        transition: transform 0.2s ease, box-shadow 0.2s ease;
-    }
-    [data-testid="stFormSubmitButton"] button {
-        background: var(--accent) !important;
-        color: #1a1a1a !important;
-    }
-    [data-testid="stDownloadButton"] button {
-        background: var(--accent) !important;
-        color: #1a1a1a !important;
-    }
-    [data-testid="baseButton-secondary"] {
-        background: var(--card-2) !important;
-        color: var(--text) !important;
-        border: 1px solid var(--border) !important;
-    }
-    .stButton>button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 12px 24px rgba(0,0,0,0.2);
-    }
-    .stRadio div[role="radiogroup"] label,
-    .stRadio div[role="radiogroup"] label span,
-    .stRadio div[role="radiogroup"] label div,
-    .stRadio div[role="radiogroup"] label p,
-    .stRadio div[role="radiogroup"] label [data-testid="stMarkdownContainer"] {
-        color: var(--text) !important;
-    }
-    .stTabs [data-baseweb="tab"] {
-        background: transparent;
-        border-bottom: 2px solid transparent;
-        color: var(--muted);
-        font-weight: 600;
-    }
-    [data-testid="stStatusWidget"] * {
-        color: var(--text) !important;
-    }
-    .env-card label,
-    .env-card span,
-    .env-card p,
-    .env-card [data-testid="stToggle"] label,
-    .env-card [data-testid="stToggle"] span,
-    .env-card [data-testid="stToggle"] div,
-    .env-card [data-testid="stToggle"] p,
-    .env-card [data-testid="stToggle"] * {
-        color: var(--text) !important;
-    }
-    .env-toggle-label {
-        color: var(--text);
-        font-weight: 600;
-        margin-top: 6px;
-    }
-    .env-toggle [data-testid="stWidgetLabel"] p,
-    .env-toggle [data-testid="stWidgetLabel"] span,
-    .env-toggle [data-testid="stWidgetLabel"] div,
-    .env-toggle [data-testid="stWidgetLabel"] * {
-        color: var(--text) !important;
-    }
-    .env-remove {
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        height: 100%;
-    }
-    .env-remove button {
-        height: 40px;
-    }
-    .profile-remove {
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        height: 100%;
-    }
-    .profile-remove button {
-        width: 36px;
-        height: 36px;
-        padding: 0;
-        border-radius: 10px;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-    }
-    .env-remove button {
-        padding: 0.4rem 0.6rem;
-        width: 100%;
-        font-size: 0.85rem;
-        line-height: 1.1;
-        border-radius: 10px;
-        white-space: nowrap;
-    }
-    .stTabs [aria-selected="true"] {
-        color: var(--text);
-        border-color: var(--accent);
-    }
-    [data-testid="stSidebar"] [data-testid="stWidgetLabel"] p,
-    [data-testid="stSidebar"] [data-testid="stWidgetLabel"] span,
-    [data-testid="stSidebar"] [data-testid="stWidgetLabel"] div,
-    [data-testid="stSidebar"] [data-testid="stWidgetLabel"] * {
-        color: #111111 !important;
-    }
-    [data-testid="stWidgetLabel"] p,
-    [data-testid="stWidgetLabel"] span,
-    [data-testid="stWidgetLabel"] div,
-    [data-testid="stWidgetLabel"] * {
-        color: var(--text) !important;
-    }
-    .stSelectbox label,
-    .stTextInput label,
-    .stNumberInput label,
-    .stTextarea label,
-    .stMultiSelect label,
-    .stCheckbox label {
-        color: var(--text) !important;
-    }
-    @keyframes floatIn {
-        from { opacity: 0; transform: translateY(12px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return _cached_tail_log(str(path), stat.st_mtime_ns, stat.st_size, max_lines)
+
+
+# The scheduler rewrites trigger state constantly, so a short TTL is enough to
+# keep keystroke reruns in the automation tab off the disk.
+@st.cache_data(ttl=2, show_spinner=False)
+def _cached_load_trigger_state() -> dict:
+    return load_trigger_state()
+
+
+@st.cache_data(show_spinner=False)
+def _agents_root_str() -> str:
+    return format_path(get_agents_root())
 
-logo_path = APP_ROOT / "assets" / "agentica_logo.png"
-logo_data = ""
-if logo_path.exists():
-    logo_data = base64.b64encode(logo_path.read_bytes()).decode("ascii")
 
-st.markdown(
-    f"""
+@st.cache_resource(show_spinner=False)
+def app_css_tag() -> str:
+    css_path = APP_ROOT / "assets" / "app.css"
+    try:
+        return f"<style>\n{css_path.read_text(encoding='utf-8')}</style>"
+    except OSError:
+        return ""
+
+
+@st.cache_resource(show_spinner=False)
+def get_logo_b64(path: str) -> str:
+    logo_file = Path(path)
+    if not logo_file.exists():
+        return ""
+    return base64.b64encode(logo_file.read_bytes()).decode("ascii")
+
+
+@st.cache_resource(show_spinner=False)
+def hero_html() -> str:
+    logo_data = get_logo_b64(str(APP_ROOT / "assets" / "agentica_logo.png"))
+    return f"""
     <div class="app-hero">
         <div class="hero-logo">
             {f'<img src="data:image/png;base64,{logo_data}" />' if logo_data else ''}
@@ -2578,21 +3341,29 @@ st.markdown(
         <h1>Orchestrate your AI agents with clarity and control</h1>
         <p class="hero-subtitle">Manage files, environments, launches, and live output from a single, focused workspace.</p>
     </div>
-    """,
-    unsafe_allow_html=True,
-)
+    """
+
+
+st.set_page_config(page_title="Agentica", page_icon="🤖", layout="wide")
+ensure_secrets_db()
+TRIGGER_MANAGER.ensure_started()
+HEALTH_MANAGER.ensure_started()
+
+st.markdown(app_css_tag(), unsafe_allow_html=True)
+st.markdown(hero_html(), unsafe_allow_html=True)
 
 
 with st.sidebar:
     st.markdown("### Settings")
     if st.button("Refresh App"):
         st.rerun()
-    current_root = format_path(get_agents_root())
+    current_root = _agents_root_str()
     agents_root_input = st.text_input("Agents root", value=current_root)
     if st.button("Save root"):
         settings = load_settings()
         settings["agents_root"] = str(Path(agents_root_input).expanduser())
         save_settings(settings)
+        _agents_root_str.clear()
         st.success("Saved settings.json")
         st.rerun()
     with st.expander("GitHub credentials", expanded=False):
@@ -2697,848 +3468,730 @@ if not agents:
 left, right = st.columns([0.32, 0.68], gap="large")
 
 with left:
-    st.markdown('<div class="card">', unsafe_allow_html=True)
-    st.markdown("### Agents")
-    agent_names = [agent.name for agent in agents]
-    selected_name = st.radio("Available agents", agent_names, label_visibility="collapsed")
-    selected_agent = next(agent for agent in agents if agent.name == selected_name)
-    st.markdown("</div>", unsafe_allow_html=True)
+    with st.container(border=True):
+        st.markdown("### Agents")
+        agent_names = [agent.name for agent in agents]
+        selected_name = st.radio("Available agents", agent_names, label_visibility="collapsed")
+        selected_agent = next(agent for agent in agents if agent.name == selected_name)
 
 with right:
-    st.markdown('<div class="card">', unsafe_allow_html=True)
-    st.markdown(f"### {selected_agent.name}")
-    st.markdown(
-        f'<div class="file-path">{format_path(selected_agent)}</div>',
-        unsafe_allow_html=True,
-    )
-    venv_exists = venv_activate_path(selected_agent).exists()
-    st.markdown(
-        f'<p class="muted">Virtualenv: {"Found" if venv_exists else "Missing"} · '
-        f'Files: {len(list_files(selected_agent))}</p>',
-        unsafe_allow_html=True,
-    )
-    st.markdown("</div>", unsafe_allow_html=True)
+    with st.container(border=True):
+        st.markdown(f"### {selected_agent.name}")
+        st.markdown(
+            f'<div class="file-path">{format_path(selected_agent)}</div>',
+            unsafe_allow_html=True,
+        )
+        venv_exists = venv_activate_path(selected_agent).exists()
+        file_list = _cached_list_files(str(selected_agent), path_mtime_ns(selected_agent))
+        st.markdown(
+            f'<p class="muted">Virtualenv: {"Found" if venv_exists else "Missing"} · '
+            f'Files: {len(file_list)}</p>',
+            unsafe_allow_html=True,
+        )
 
+    # Stateful tabs rerun on switch and expose .open, so heavy tab bodies can
+    # be skipped while another tab is showing.
     overview_tab, files_tab, env_tab, setup_tab, run_tab, automation_tab, marketplace_tab, versioning_tab = st.tabs(
-        ["Overview", "Files", "Environments", "Setup", "Run & Monitor", "Automation", "Marketplace", "Versioning"]
+        ["Overview", "Files", "Environments", "Setup", "Run & Monitor", "Automation", "Marketplace", "Versioning"],
+        key="agent-tabs",
+        on_change="rerun",
     )
 
     with overview_tab:
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown("#### Agent details")
-        readme_path = selected_agent / "README.md"
-        if readme_path.exists():
-            st.markdown(readme_path.read_text(errors="ignore"))
-        else:
-            st.markdown(
-                "No README found. Use the Files tab to explore source and configs."
-            )
-        st.markdown("</div>", unsafe_allow_html=True)
+        if overview_tab.open:
+            with st.container(border=True):
+                st.markdown("#### Agent details")
+                readme_path = selected_agent / "README.md"
+                if readme_path.exists():
+                    st.markdown(readme_path.read_text(errors="ignore"))
+                else:
+                    st.markdown(
+                        "No README found. Use the Files tab to explore source and configs."
+                    )
 
     with files_tab:
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown("#### Browse & edit files")
-
-        # Add files section
-        add_files_col1, add_files_col2 = st.columns([0.5, 0.5])
-        with add_files_col1:
-            if st.button("➕ Create File", key="create-file-btn", use_container_width=True):
-                st.session_state.show_create_file = True
-                st.session_state.show_upload_file = False
-        with add_files_col2:
-            if st.button("📤 Upload File", key="upload-file-btn", use_container_width=True):
-                st.session_state.show_upload_file = True
-                st.session_state.show_create_file = False
-
-        # Create File Dialog
-        if st.session_state.get("show_create_file"):
-            with st.container():
-                st.markdown("---")
-                st.markdown("**Create New File**")
-                new_file_path = st.text_input(
-                    "File path (relative to agent folder)",
-                    value="",
-                    key="new-file-path",
-                    placeholder="e.g., src/utils.py or config.json",
-                )
-                new_file_content = st.text_area(
-                    "File content",
-                    value="",
-                    height=200,
-                    key="new-file-content",
-                    placeholder="Enter file content here...",
-                )
-                create_col1, create_col2 = st.columns([0.5, 0.5])
-                with create_col1:
-                    if st.button("Save File", key="save-new-file-btn", type="primary"):
-                        if new_file_path and new_file_path.strip():
-                            try:
-                                target_path = selected_agent / new_file_path.strip()
-                                # Create parent directories if needed
-                                target_path.parent.mkdir(parents=True, exist_ok=True)
-                                target_path.write_text(new_file_content)
-                                st.success(f"Created: {new_file_path}")
+        if files_tab.open:
+            with st.container(border=True):
+                st.markdown("#### Browse & edit files")
+
+                # Add files section
+                add_files_col1, add_files_col2 = st.columns([0.5, 0.5])
+                with add_files_col1:
+                    if st.button("➕ Create File", key="create-file-btn", use_container_width=True):
+                        st.session_state.show_create_file = True
+                        st.session_state.show_upload_file = False
+                with add_files_col2:
+                    if st.button("📤 Upload File", key="upload-file-btn", use_container_width=True):
+                        st.session_state.show_upload_file = True
+                        st.session_state.show_create_file = False
+
+                # Create File Dialog
+                if st.session_state.get("show_create_file"):
+                    with st.container():
+                        st.markdown("---")
+                        st.markdown("**Create New File**")
+                        new_file_path = st.text_input(
+                            "File path (relative to agent folder)",
+                            value="",
+                            key="new-file-path",
+                            placeholder="e.g., src/utils.py or config.json",
+                        )
+                        new_file_content = st.text_area(
+                            "File content",
+                            value="",
+                            height=200,
+                            key="new-file-content",
+                            placeholder="Enter file content here...",
+                        )
+                        create_col1, create_col2 = st.columns([0.5, 0.5])
+                        with create_col1:
+                            if st.button("Save File", key="save-new-file-btn", type="primary"):
+                                if new_file_path and new_file_path.strip():
+                                    try:
+                                        target_path = selected_agent / new_file_path.strip()
+                                        # Create parent directories if needed
+                                        target_path.parent.mkdir(parents=True, exist_ok=True)
+                                        target_path.write_text(new_file_content)
+                                        _cached_list_files.clear()
+                                        st.success(f"Created: {new_file_path}")
+                                        st.session_state.show_create_file = False
+                                        st.rerun()
+                                    except Exception as e:
+                                        st.error(f"Failed to create file: {e}")
+                                else:
+                                    st.warning("Please enter a file path.")
+                        with create_col2:
+                            if st.button("Cancel", key="cancel-create-file-btn"):
                                 st.session_state.show_create_file = False
                                 st.rerun()
-                            except Exception as e:
-                                st.error(f"Failed to create file: {e}")
-                        else:
-                            st.warning("Please enter a file path.")
-                with create_col2:
-                    if st.button("Cancel", key="cancel-create-file-btn"):
-                        st.session_state.show_create_file = False
-                        st.rerun()
-                st.markdown("---")
-
-        # Upload File Dialog
-        if st.session_state.get("show_upload_file"):
-            with st.container():
-                st.markdown("---")
-                st.markdown("**Upload File**")
-                upload_subdir = st.text_input(
-                    "Upload to subfolder (optional)",
-                    value="",
-                    key="upload-subdir",
-                    placeholder="e.g., src/ or leave empty for root",
-                )
-                uploaded_files = st.file_uploader(
-                    "Choose files to upload",
-                    accept_multiple_files=True,
-                    key="file-uploader",
-                )
-                upload_col1, upload_col2 = st.columns([0.5, 0.5])
-                with upload_col1:
-                    if st.button("Upload", key="confirm-upload-btn", type="primary"):
-                        if uploaded_files:
-                            upload_count = 0
-                            for uploaded_file in uploaded_files:
-                                try:
-                                    if upload_subdir and upload_subdir.strip():
-                                        target_dir = selected_agent / upload_subdir.strip()
-                                    else:
-                                        target_dir = selected_agent
-                                    target_dir.mkdir(parents=True, exist_ok=True)
-                                    target_path = target_dir / uploaded_file.name
-                                    target_path.write_bytes(uploaded_file.getbuffer())
-                                    upload_count += 1
-                                except Exception as e:
-                                    st.error(f"Failed to upload {uploaded_file.name}: {e}")
-                            if upload_count > 0:
-                                st.success(f"Uploaded {upload_count} file(s).")
+                        st.markdown("---")
+
+                # Upload File Dialog
+                if st.session_state.get("show_upload_file"):
+                    with st.container():
+                        st.markdown("---")
+                        st.markdown("**Upload File**")
+                        upload_subdir = st.text_input(
+                            "Upload to subfolder (optional)",
+                            value="",
+                            key="upload-subdir",
+                            placeholder="e.g., src/ or leave empty for root",
+                        )
+                        uploaded_files = st.file_uploader(
+                            "Choose files to upload",
+                            accept_multiple_files=True,
+                            key="file-uploader",
+                        )
+                        upload_col1, upload_col2 = st.columns([0.5, 0.5])
+                        with upload_col1:
+                            if st.button("Upload", key="confirm-upload-btn", type="primary"):
+                                if uploaded_files:
+                                    upload_count = 0
+                                    for uploaded_file in uploaded_files:
+                                        try:
+                                            if upload_subdir and upload_subdir.strip():
+                                                target_dir = selected_agent / upload_subdir.strip()
+                                            else:
+                                                target_dir = selected_agent
+                                            target_dir.mkdir(parents=True, exist_ok=True)
+                                            target_path = target_dir / uploaded_file.name
+                                            target_path.write_bytes(uploaded_file.getbuffer())
+                                            upload_count += 1
+                                        except Exception as e:
+                                            st.error(f"Failed to upload {uploaded_file.name}: {e}")
+                                    if upload_count > 0:
+                                        _cached_list_files.clear()
+                                        st.success(f"Uploaded {upload_count} file(s).")
+                                        st.session_state.show_upload_file = False
+                                        st.rerun()
+                                else:
+                                    st.warning("Please select files to upload.")
+                        with upload_col2:
+                            if st.button("Cancel", key="cancel-upload-btn"):
                                 st.session_state.show_upload_file = False
                                 st.rerun()
-                        else:
-                            st.warning("Please select files to upload.")
-                with upload_col2:
-                    if st.button("Cancel", key="cancel-upload-btn"):
-                        st.session_state.show_upload_file = False
-                        st.rerun()
-                st.markdown("---")
+                        st.markdown("---")
 
-        # File browser
-        file_list = list_files(selected_agent)
-        if not file_list:
-            st.info("No files found. Use the buttons above to create or upload files.")
-        else:
-            file_options = [str(path.relative_to(selected_agent)) for path in file_list]
-            selected_rel = st.selectbox("File", file_options)
-            selected_path = selected_agent / selected_rel
-            file_size = selected_path.stat().st_size
-            if file_size > 500_000:
-                st.warning("File too large to load in editor.")
-            else:
-                content = selected_path.read_text(errors="ignore")
-                edited = st.text_area(
-                    "File content",
-                    value=content,
-                    height=360,
-                    help="Edit and save changes directly.",
-                )
-                col_save, col_delete = st.columns([0.5, 0.5])
-                with col_save:
-                    if st.button("Save file", key="save-existing-file"):
-                        selected_path.write_text(edited)
-                        st.success("Saved.")
-                with col_delete:
-                    if st.button("Delete file", key="delete-existing-file"):
-                        st.session_state.confirm_delete_file = selected_rel
-
-            # Delete file confirmation
-            if st.session_state.get("confirm_delete_file") == selected_rel:
-                st.warning(f"Are you sure you want to delete '{selected_rel}'?")
-                del_col1, del_col2 = st.columns([0.5, 0.5])
-                with del_col1:
-                    if st.button("Yes, delete", key="confirm-delete-file-yes", type="primary"):
-                        try:
-                            selected_path.unlink()
-                            st.success(f"Deleted: {selected_rel}")
-                            st.session_state.confirm_delete_file = None
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Failed to delete: {e}")
-                with del_col2:
-                    if st.button("Cancel", key="confirm-delete-file-no"):
-                        st.session_state.confirm_delete_file = None
-                        st.rerun()
+                # File browser
+                if not file_list:
+                    st.info("No files found. Use the buttons above to create or upload files.")
+                else:
+                    file_options = [str(path.relative_to(selected_agent)) for path in file_list]
+                    selected_rel = st.selectbox("File", file_options)
+                    selected_path = selected_agent / selected_rel
+                    file_size = selected_path.stat().st_size
+                    if file_size > 500_000:
+                        st.warning("File too large to load in editor.")
+                    else:
+                        content = selected_path.read_text(errors="ignore")
+                        edited = st.text_area(
+                            "File content",
+                            value=content,
+                            height=360,
+                            help="Edit and save changes directly.",
+                        )
+                        col_save, col_delete = st.columns([0.5, 0.5])
+                        with col_save:
+                            if st.button("Save file", key="save-existing-file"):
+                                selected_path.write_text(edited)
+                                st.success("Saved.")
+                        with col_delete:
+                            if st.button("Delete file", key="delete-existing-file"):
+                                st.session_state.confirm_delete_file = selected_rel
+
+                    # Delete file confirmation
+                    if st.session_state.get("confirm_delete_file") == selected_rel:
+                        st.warning(f"Are you sure you want to delete '{selected_rel}'?")
+                        del_col1, del_col2 = st.columns([0.5, 0.5])
+                        with del_col1:
+                            if st.button("Yes, delete", key="confirm-delete-file-yes", type="primary"):
+                                try:
+                                    selected_path.unlink()
+                                    _cached_list_files.clear()
+                                    st.success(f"Deleted: {selected_rel}")
+                                    st.session_state.confirm_delete_file = None
+                                    st.rerun()
+                                except Exception as e:
+                                    st.error(f"Failed to delete: {e}")
+                        with del_col2:
+                            if st.button("Cancel", key="confirm-delete-file-no"):
+                                st.session_state.confirm_delete_file = None
+                                st.rerun()
 
-        st.markdown("</div>", unsafe_allow_html=True)
 
     with env_tab:
-        st.markdown('<div class="card env-card">', unsafe_allow_html=True)
-        st.markdown("#### Secrets manager")
-        if Fernet is None:
-            st.error("Secrets manager requires 'cryptography'. Install it first.")
-            st.stop()
-        env_path = selected_agent / ".env"
-
-        if env_path.exists():
-            st.warning("A legacy .env file exists. Migrate it into secrets for safer storage.")
-            st.caption("Agentica will still read .env at runtime until you delete it.")
-            if st.button("Migrate .env to secrets"):
-                count = migrate_env_to_secrets(selected_agent.name, env_path)
-                st.success(f"Migrated {count} keys into secrets.")
-            if st.button("Delete .env"):
-                env_path.unlink(missing_ok=True)
-                st.success("Deleted .env.")
-
-        secrets = load_secrets(selected_agent.name)
-        if (
-            st.session_state.get("secrets_agent") != selected_agent.name
-            or "secret_rows" not in st.session_state
-        ):
-            st.session_state.secret_rows = [
-                {"id": idx, "key": row["key"], "value": row["value"], "has_value": row["has_value"]}
-                for idx, row in enumerate(secrets)
-            ]
-            st.session_state.secret_next_id = len(st.session_state.secret_rows)
-            st.session_state.secrets_agent = selected_agent.name
-
-        col_toggle, col_label = st.columns([0.08, 0.92])
-        with col_toggle:
-            hide_values = st.toggle("Hide values", value=True, label_visibility="collapsed")
-        with col_label:
-            st.markdown('<div class="env-toggle-label">Hide values</div>', unsafe_allow_html=True)
-
-        rows = st.session_state.secret_rows
-        remove_index = None
-        for idx, row in enumerate(rows):
-            col_key, col_val, col_remove = st.columns(
-                [0.36, 0.54, 0.18], vertical_alignment="center"
+        with st.container(border=True):
+            st.markdown("#### Secrets manager")
+            if Fernet is None:
+                st.error("Secrets manager requires 'cryptography'. Install it first.")
+                st.stop()
+            env_path = selected_agent / ".env"
+
+            if env_path.exists():
+                st.warning("A legacy .env file exists. Migrate it into secrets for safer storage.")
+                st.caption("Agentica will still read .env at runtime until you delete it.")
+                if st.button("Migrate .env to secrets"):
+                    count = migrate_env_to_secrets(selected_agent.name, env_path)
+                    st.success(f"Migrated {count} keys into secrets.")
+                if st.button("Delete .env"):
+                    env_path.unlink(missing_ok=True)
+                    st.success("Deleted .env.")
+
+            # Only hit the DB (and decrypt) when the agent changed or the secrets
+            # file was written since the rows were loaded.
+            secrets_mtime = path_mtime_ns(SECRETS_DB_PATH)
+            if (
+                st.session_state.get("secrets_agent") != selected_agent.name
+                or "secret_rows" not in st.session_state
+                or st.session_state.get("secrets_mtime") != secrets_mtime
+            ):
+                st.session_state.secret_rows = [
+                    {"id": idx, "key": row["key"], "value": row["value"], "has_value": row["has_value"]}
+                    for idx, row in enumerate(load_secrets(selected_agent.name))
+                ]
+                st.session_state.secrets_agent = selected_agent.name
+                st.session_state.secrets_mtime = path_mtime_ns(SECRETS_DB_PATH)
+                st.session_state.secret_editor_version = st.session_state.get("secret_editor_version", 0) + 1
+
+            col_toggle, col_label = st.columns([0.08, 0.92])
+            with col_toggle:
+                hide_values = st.toggle("Hide values", value=True, label_visibility="collapsed")
+            with col_label:
+                st.markdown('<div class="env-toggle-label">Hide values</div>', unsafe_allow_html=True)
+
+            rows = st.session_state.secret_rows
+            rows_by_id = {row["id"]: row for row in rows}
+            secrets_frame = pd.DataFrame(
+                [
+                    {
+                        "id": row["id"],
+                        "key": row.get("key", ""),
+                        "value": ("••••••••" if row.get("has_value") else "")
+                        if hide_values
+                        else row.get("value", ""),
+                    }
+                    for row in rows
+                ],
+                columns=["id", "key", "value"],
+            )
+            if hide_values:
+                st.caption("Values are masked. Use Set a value below, or turn off Hide values to edit them in place.")
+            edited_secrets = st.data_editor(
+                secrets_frame,
+                key=f"secret-editor-{selected_agent.name}-{st.session_state.get('secret_editor_version', 0)}",
+                num_rows="dynamic",
+                hide_index=True,
+                column_config={
+                    "id": None,
+                    "key": st.column_config.TextColumn("Key"),
+                    "value": st.column_config.TextColumn("Value", disabled=hide_values),
+                },
             )
-            with col_key:
-                st.text_input(
-                    "Key",
-                    value=row.get("key", ""),
-                    key=f"secret-key-{row['id']}",
-                    label_visibility="collapsed",
-                )
-            with col_val:
-                st.text_input(
-                    "Value",
-                    value=row.get("value", ""),
-                    key=f"secret-val-{row['id']}",
-                    type="password" if hide_values else "default",
-                    label_visibility="collapsed",
-                )
-            with col_remove:
-                st.markdown('<div class="env-remove">', unsafe_allow_html=True)
-                if st.button("Remove", key=f"secret-remove-{idx}"):
-                    remove_index = idx
-                st.markdown("</div>", unsafe_allow_html=True)
-
-        if remove_index is not None:
-            key_val = rows[remove_index].get("key")
-            if key_val:
-                delete_secret(selected_agent.name, key_val)
-            rows.pop(remove_index)
-            st.session_state.secret_rows = rows
-            st.rerun()
-
-        if st.button("Add secret"):
-            next_id = st.session_state.get("secret_next_id", 0)
-            rows.append({"id": next_id, "key": "", "value": "", "has_value": False})
-            st.session_state.secret_next_id = next_id + 1
-            st.session_state.secret_rows = rows
-            st.rerun()
-
-        if st.button("Save secrets"):
-            for row in rows:
-                key_val = st.session_state.get(f"secret-key-{row['id']}", row.get("key", "")).strip()
-                val_val = st.session_state.get(f"secret-val-{row['id']}", row.get("value", ""))
-                if key_val:
-                    set_secret(selected_agent.name, key_val, val_val.strip() or None)
-            st.success("Secrets saved.")
-
-        st.markdown("</div>", unsafe_allow_html=True)
 
-    with setup_tab:
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown("#### Virtual environment")
-        venv_path = venv_activate_path(selected_agent)
-        if venv_path.exists():
-            st.success("Virtualenv found.")
-        else:
-            st.warning("Virtualenv not found.")
-            if st.button("Create .venv"):
-                ok, message = create_venv(selected_agent)
-                if ok:
-                    st.success(message)
+            if hide_values:
+                st.markdown("##### Set a value")
+                with st.form(f"secret-set-{selected_agent.name}", clear_on_submit=True):
+                    col_key, col_value = st.columns(2)
+                    with col_key:
+                        masked_key = st.text_input("Key", placeholder="API_KEY")
+                    with col_value:
+                        masked_value = st.text_input("Value", type="password")
+                    set_submitted = st.form_submit_button("Set value")
+                if set_submitted:
+                    masked_key = masked_key.strip()
+                    if not masked_key:
+                        st.error("Key is required.")
+                    elif not masked_value.strip():
+                        st.error("Value is required.")
+                    else:
+                        set_secret(selected_agent.name, masked_key, masked_value.strip())
+                        values = {row["key"]: row.get("value", "") for row in rows if row.get("key")}
+                        values[masked_key] = masked_value.strip()
+                        st.session_state.secret_rows = [
+                            {"id": idx, "key": key, "value": value, "has_value": bool(value.strip())}
+                            for idx, (key, value) in enumerate(values.items())
+                        ]
+                        st.session_state.secrets_mtime = path_mtime_ns(SECRETS_DB_PATH)
+                        st.session_state.secret_editor_version = st.session_state.get("secret_editor_version", 0) + 1
+                        st.rerun()
+
+            if st.button("Save secrets"):
+                new_rows = []
+                blank_new_keys = []
+                for record in edited_secrets.to_dict("records"):
+                    key_val = (record.get("key") or "").strip()
+                    if not key_val:
+                        continue
+                    original = rows_by_id.get(record.get("id")) if pd.notna(record.get("id")) else None
+                    if hide_values:
+                        val_val = original.get("value", "") if original else ""
+                        if original is None:
+                            blank_new_keys.append(key_val)
+                    else:
+                        val_val = record.get("value") or ""
+                    new_rows.append({"key": key_val, "value": val_val})
+                if blank_new_keys:
+                    # The Value column is read-only while masked, so these rows
+                    # would be saved without a value.
+                    st.error(
+                        f"New key(s) without a value: {', '.join(blank_new_keys)}. "
+                        "Set their values above or turn off Hide values, then save again."
+                    )
                 else:
-                    st.error(message)
-                st.rerun()
+                    saved_values = {row["key"]: row.get("value", "") for row in rows if row.get("key")}
+                    edited_values = {row["key"]: row["value"] for row in new_rows}
+                    # Only touch keys that were removed or edited since the last load/save.
+                    removed = [key for key in saved_values if key not in edited_values]
+                    changed = [
+                        key for key, value in edited_values.items()
+                        if key not in saved_values or saved_values[key] != value
+                    ]
+                    for key in removed:
+                        delete_secret(selected_agent.name, key)
+                    for key in changed:
+                        set_secret(selected_agent.name, key, edited_values[key].strip() or None)
+                    st.session_state.secret_rows = [
+                        {"id": idx, "key": key, "value": value, "has_value": bool(value.strip())}
+                        for idx, (key, value) in enumerate(edited_values.items())
+                    ]
+                    st.session_state.secret_editor_version = st.session_state.get("secret_editor_version", 0) + 1
+                    if removed or changed:
+                        st.success(f"Saved {len(changed)} secret(s), removed {len(removed)}.")
+                    else:
+                        st.info("No changes to save.")
 
-        st.markdown("#### Install packages")
-        requirements_path = selected_agent / "requirements.txt"
-        if requirements_path.exists():
-            st.success("requirements.txt found.")
-        else:
-            st.warning("requirements.txt not found.")
 
-        if not venv_path.exists():
-            st.info("Create the virtualenv before installing packages.")
-        elif not requirements_path.exists():
-            st.error("Add a requirements.txt file to install packages.")
-        else:
-            if st.button("Install requirements"):
-                ok, message = install_requirements(selected_agent)
-                if ok:
-                    st.success(message)
-                else:
-                    st.error(message)
-        st.markdown("</div>", unsafe_allow_html=True)
+    with setup_tab:
+        with st.container(border=True):
+            st.markdown("#### Virtual environment")
+            # venv_exists was stat'ed once for the header above.
+            if venv_exists:
+                st.success("Virtualenv found.")
+            else:
+                st.warning("Virtualenv not found.")
+                if st.button("Create .venv"):
+                    ok, message = create_venv(selected_agent)
+                    if ok:
+                        st.success(message)
+                    else:
+                        st.error(message)
+                    st.rerun()
+
+            st.markdown("#### Install packages")
+            requirements_exist = (selected_agent / "requirements.txt").exists()
+            if requirements_exist:
+                st.success("requirements.txt found.")
+            else:
+                st.warning("requirements.txt not found.")
+
+            if not venv_exists:
+                st.info("Create the virtualenv before installing packages.")
+            elif not requirements_exist:
+                st.error("Add a requirements.txt file to install packages.")
+            else:
+                if st.button("Install requirements"):
+                    ok, message = install_requirements(selected_agent)
+                    if ok:
+                        st.success(message)
+                    else:
+                        st.error(message)
 
     with run_tab:
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown("#### Launch controls")
-        profiles = RUN_PROFILES.get(selected_agent.name, [])
-        if not profiles:
-            st.warning("No run profile configured for this agent.")
-            st.markdown("#### Add run profiles")
-            render_profile_editor(f"profile-{selected_agent.name}")
-            if st.button("Save run profiles", key=f"save-profiles-{selected_agent.name}"):
-                new_profiles = collect_profile_editor(f"profile-{selected_agent.name}")
-                if not new_profiles:
-                    st.error("Add at least one run profile.")
-                else:
-                    all_profiles = load_profiles()
-                    all_profiles[selected_agent.name] = new_profiles
-                    save_profiles(all_profiles)
-                    st.success("Run profiles saved.")
+        with st.container(border=True):
+            st.markdown("#### Launch controls")
+            profiles = RUN_PROFILES.get(selected_agent.name, [])
+            if not profiles:
+                st.warning("No run profile configured for this agent.")
+                st.markdown("#### Add run profiles")
+                render_profile_editor(f"profile-{selected_agent.name}")
+                if st.button("Save run profiles", key=f"save-profiles-{selected_agent.name}"):
+                    new_profiles = collect_profile_editor(f"profile-{selected_agent.name}")
+                    if not new_profiles:
+                        st.error("Add at least one run profile.")
+                    else:
+                        all_profiles = load_profiles()
+                        all_profiles[selected_agent.name] = new_profiles
+                        save_profiles(all_profiles)
+                        st.success("Run profiles saved.")
+                        st.rerun()
+            else:
+                existing = [
+                    p for p in state["processes"] if p["agent"] == selected_agent.name
+                ]
+                if existing:
+                    st.warning("This agent has running processes.")
+                if st.button("Run agent"):
+                    new_items = []
+                    for profile, item, exc in start_processes(selected_agent.name, profiles, selected_agent):
+                        if exc is not None:
+                            st.error(f"Failed to start {profile.label}: {exc}")
+                            continue
+                        if item.get("pid") is None:
+                            st.error(f"{profile.label} not started. Check log for details.")
+                            continue
+                        HEALTH_MANAGER.clear_manual_stop(selected_agent.name, profile.label)
+                        new_items.append(item)
+                        if profile.streamlit_port:
+                            open_streamlit_tab(profile.streamlit_port)
+                    if new_items:
+                        # Atomically add all new processes to state
+                        def add_processes(s):
+                            s.setdefault("processes", []).extend(new_items)
+                            return s
+                        atomic_state_update(add_processes)
+                        st.success("Agent started.")
+                    else:
+                        st.warning("No processes started. See launch logs below.")
                     st.rerun()
-        else:
-            existing = [
-                p for p in state["processes"] if p["agent"] == selected_agent.name
-            ]
-            if existing:
-                st.warning("This agent has running processes.")
-            if st.button("Run agent"):
-                new_items = []
-                for profile in profiles:
-                    try:
-                        item = start_process(selected_agent.name, profile, selected_agent)
-                    except Exception as exc:
-                        st.error(f"Failed to start {profile.label}: {exc}")
-                        continue
-                    if item.get("pid") is None:
-                        st.error(f"{profile.label} not started. Check log for details.")
-                        continue
-                    HEALTH_MANAGER.clear_manual_stop(selected_agent.name, profile.label)
-                    new_items.append(item)
-                    if profile.streamlit_port:
-                        open_streamlit_tab(profile.streamlit_port)
-                if new_items:
-                    # Atomically add all new processes to state
-                    def add_processes(s):
-                        s.setdefault("processes", []).extend(new_items)
-                        return s
-                    atomic_state_update(add_processes)
-                    st.success("Agent started.")
-                else:
-                    st.warning("No processes started. See launch logs below.")
-                st.rerun()
 
-            st.markdown("#### Health checks")
-            health_config = load_health_config()
-            health_state = load_health_state()
-            for profile in profiles:
-                key = profile_key(selected_agent.name, profile.label)
-                config = health_config.get(key, {})
-                if not config:
-                    probe_type = "http" if profile.streamlit_port else "disabled"
-                    config = {
-                        "probe_type": probe_type,
-                        "port": profile.streamlit_port,
-                        "probe_command": "",
-                        "auto_restart": False,
-                    }
-                    health_config[key] = config
-                    save_health_config(health_config)
-                status = health_state.get("profiles", {}).get(key, {})
-                with st.expander(f"{profile.label} health", expanded=False):
-                    st.markdown(
-                        f"**Status:** {status.get('status', 'unknown')} · "
-                        f"**Restarts:** {status.get('restart_count', 0)}"
-                    )
-                    probe_type = st.selectbox(
-                        "Probe type",
-                        ["http", "command", "disabled"],
-                        index=["http", "command", "disabled"].index(config.get("probe_type", "disabled")),
-                        key=f"probe-type-{key}",
-                    )
-                    config["probe_type"] = probe_type
-                    if probe_type == "http":
-                        port_val = config.get("port") or profile.streamlit_port or 0
-                        port_val = st.number_input(
-                            "HTTP port",
-                            min_value=0,
-                            max_value=65535,
-                            value=int(port_val),
-                            key=f"probe-port-{key}",
-                        )
-                        config["port"] = int(port_val)
-                    elif probe_type == "command":
-                        cmd_val = st.text_input(
-                            "Probe command",
-                            value=config.get("probe_command", ""),
-                            key=f"probe-cmd-{key}",
-                            placeholder="python3 health_check.py",
-                        )
-                        config["probe_command"] = cmd_val
-                    auto_restart = st.toggle(
-                        "Auto-restart on crash",
-                        value=bool(config.get("auto_restart", False)),
-                        key=f"auto-restart-{key}",
-                    )
-                    config["auto_restart"] = bool(auto_restart)
-                    health_config[key] = config
-            save_health_config(health_config)
-
-        st.markdown("#### Running agents")
-        if st.button("Refresh status"):
-            refresh_state(load_state())
-            st.rerun()
-        running = refresh_state(load_state()).get("processes", [])
-        if not running:
-            st.info("No agents running.")
-        else:
-            for item in running:
-                log_path = Path(item["log_path"])
-                title = f"{item['agent']} · {item['label']}"
-                with st.expander(title, expanded=False):
-                        key = profile_key(item["agent"], item["label"])
-                        health_state = load_health_state()
-                        health = health_state.get("profiles", {}).get(key, {})
-                        uptime = time.time() - item["started_at"]
-                        last_log_time = health.get("last_log_time")
-                        last_log_display = (
-                            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(last_log_time))
-                            if last_log_time
-                            else "n/a"
-                        )
-                        st.markdown(
-                            f"**Status:** {health.get('status', 'unknown')} · "
-                            f"**Uptime:** {int(uptime)}s · "
-                            f"**Last log line:** {last_log_display} · "
-                            f"**Restarts:** {health.get('restart_count', 0)}"
-                        )
+                st.markdown("#### Health checks")
+                health_config = load_health_config()
+                health_state = load_health_state()
+                for profile in profiles:
+                    key = profile_key(selected_agent.name, profile.label)
+                    config = health_config.get(key, {})
+                    if not config:
+                        probe_type = "http" if profile.streamlit_port else "disabled"
+                        config = {
+                            "probe_type": probe_type,
+                            "port": profile.streamlit_port,
+                            "probe_command": "",
+                            "auto_restart": False,
+                        }
+                        health_config[key] = config
+                        save_health_config(health_config)
+                    status = health_state.get("profiles", {}).get(key, {})
+                    with st.expander(f"{profile.label} health", expanded=False):
                         st.markdown(
-                            f"**PID:** {item['pid']} · **Command:** `{item['command']}`"
+                            f"**Status:** {status.get('status', 'unknown')} · "
+                            f"**Restarts:** {status.get('restart_count', 0)}"
                         )
-                        st.markdown(
-                            f"**Started:** {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(item['started_at']))}"
+                        probe_type = st.selectbox(
+                            "Probe type",
+                            ["http", "command", "disabled"],
+                            index=["http", "command", "disabled"].index(config.get("probe_type", "disabled")),
+                            key=f"probe-type-{key}",
                         )
-                        if item.get("streamlit_port"):
-                            url = f"http://localhost:{item['streamlit_port']}"
-                            st.link_button("Open Streamlit UI", url)
-                        if st.button(
-                            f"Stop {item['agent']} {item['label']}",
-                            key=f"stop-{item['pid']}",
-                        ):
-                            stopped, message = stop_item_process(item)
-                            if stopped:
-                                HEALTH_MANAGER.mark_manual_stop(item["agent"], item["label"])
-                                # Load fresh state and remove ONLY the stopped process
-                                current_state = load_state()
-                                current_state["processes"] = [
-                                    p for p in current_state.get("processes", [])
-                                    if p.get("pid") != item["pid"]
-                                ]
-                                save_state(current_state)
-                                # Don't call refresh_state here - it may incorrectly
-                                # remove other processes due to timing issues
-                                st.success(message)
-                                st.rerun()
-                            else:
-                                st.error(message)
-                        if st.button(
-                            f"Restart {item['agent']} {item['label']}",
-                            key=f"restart-{item['pid']}",
-                        ):
-                            profiles = load_profiles().get(item["agent"], [])
-                            profile = next((p for p in profiles if p.label == item["label"]), None)
-                            if profile:
-                                restarted = restart_profile_process(item["agent"], profile, Path(item["cwd"]))
-                                if restarted:
-                                    state = load_health_state()
-                                    entry = state["profiles"].setdefault(
-                                        profile_key(item["agent"], item["label"]),
-                                        {"restart_count": 0},
-                                    )
-                                    entry["restart_count"] = int(entry.get("restart_count", 0)) + 1
-                                    entry["manual_stop"] = False
-                                    save_health_state(state)
-                                    st.success("Restarted.")
-                                    st.rerun()
-                                else:
-                                    st.error("Restart failed. Check logs.")
-                        log_tail = tail_log(log_path)
-                        if log_tail:
-                            st.text_area(
-                                "Recent output",
-                                value=log_tail,
-                                height=220,
-                                key=f"log-tail-{item['agent']}-{item['label']}-{item['pid']}",
+                        config["probe_type"] = probe_type
+                        if probe_type == "http":
+                            port_val = config.get("port") or profile.streamlit_port or 0
+                            port_val = st.number_input(
+                                "HTTP port",
+                                min_value=0,
+                                max_value=65535,
+                                value=int(port_val),
+                                key=f"probe-port-{key}",
                             )
-                        else:
-                            st.markdown("No output yet.")
-
-        st.markdown("</div>", unsafe_allow_html=True)
-
-    with automation_tab:
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown("#### Schedules & triggers")
-        triggers_data = load_triggers()
-        agent_rules = triggers_data.get(selected_agent.name, [])
-        trigger_state = load_trigger_state()
+                            config["port"] = int(port_val)
+                        elif probe_type == "command":
+                            cmd_val = st.text_input(
+                                "Probe command",
+                                value=config.get("probe_command", ""),
+                                key=f"probe-cmd-{key}",
+                                placeholder="python3 health_check.py",
+                            )
+                            config["probe_command"] = cmd_val
+                        auto_restart = st.toggle(
+                            "Auto-restart on crash",
+                            value=bool(config.get("auto_restart", False)),
+                            key=f"auto-restart-{key}",
+                        )
+                        config["auto_restart"] = bool(auto_restart)
+                        health_config[key] = config
+                save_health_config(health_config)
 
-        if not agent_rules:
-            st.info("No schedules or triggers configured for this agent.")
-        else:
-            for rule in agent_rules:
-                rule_id = rule.get("id", "")
-                title = rule.get("label") or rule.get("kind", "Automation").title()
-                with st.expander(title, expanded=False):
-                    profile_label = rule.get("profile_label", "unknown")
-                    kind = rule.get("kind", "schedule")
-                    enabled_key = f"trigger-enabled-{rule_id}"
-                    if enabled_key not in st.session_state:
-                        st.session_state[enabled_key] = rule.get("enabled", True)
-                    enabled_val = st.toggle("Enabled", key=enabled_key)
-                    if enabled_val != rule.get("enabled", True):
-                        rule["enabled"] = enabled_val
-                        triggers_data[selected_agent.name] = agent_rules
-                        save_triggers(triggers_data)
-                        TRIGGER_MANAGER.reload_triggers()
-                    st.markdown(f"**Profile:** `{profile_label}` · **Type:** `{kind}`")
-                    if kind == "schedule":
-                        schedule_type = rule.get("schedule_type", "hourly")
-                        if schedule_type == "hourly":
-                            st.markdown(f"Runs hourly at minute `{rule.get('minute', 0)}`.")
-                        elif schedule_type == "daily":
-                            st.markdown(
-                                f"Runs daily at `{rule.get('hour', 0):02d}:{rule.get('minute', 0):02d}`."
+            st.markdown("#### Running agents")
+            if st.button("Refresh status"):
+                refresh_state(load_state())
+                st.rerun()
+            running = refresh_state(load_state()).get("processes", [])
+            if not running:
+                st.info("No agents running.")
+            else:
+                for item in running:
+                    log_path = Path(item["log_path"])
+                    title = f"{item['agent']} · {item['label']}"
+                    with st.expander(title, expanded=False):
+                            key = profile_key(item["agent"], item["label"])
+                            health_state = load_health_state()
+                            health = health_state.get("profiles", {}).get(key, {})
+                            uptime = time.time() - item["started_at"]
+                            last_log_time = health.get("last_log_time")
+                            last_log_display = (
+                                time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(last_log_time))
+                                if last_log_time
+                                else "n/a"
                             )
-                        else:
-                            st.markdown(f"Cron: `{rule.get('cron', '* * * * *')}`")
-                    else:
-                        event_type = rule.get("event_type")
-                        if event_type in {"file_new", "file_change"}:
                             st.markdown(
-                                f"Folder: `{rule.get('path', '')}` · Pattern: `{rule.get('pattern', '*')}`"
+                                f"**Status:** {health.get('status', 'unknown')} · "
+                                f"**Uptime:** {int(uptime)}s · "
+                                f"**Last log line:** {last_log_display} · "
+                                f"**Restarts:** {health.get('restart_count', 0)}"
                             )
                             st.markdown(
-                                f"Recursive: `{rule.get('recursive', False)}` · Event: `{event_type}`"
+                                f"**PID:** {item['pid']} · **Command:** `{item['command']}`"
                             )
-                        else:
-                            hook_path = rule.get("webhook_path", "")
                             st.markdown(
-                                f"Webhook URL: `http://localhost:{WEBHOOK_PORT}{hook_path}`"
+                                f"**Started:** {item.get('started_at_str') or time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(item['started_at']))}"
                             )
-                            if event_type == "github_push":
-                                st.caption("GitHub event: push")
-                    last_run = trigger_state.get("last_run", {}).get(rule_id)
-                    if last_run:
-                        st.markdown(
-                            f"**Last run:** {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(last_run))}"
-                        )
-                    col_run, col_delete = st.columns([0.2, 0.8])
-                    with col_run:
-                        if st.button("Run now", key=f"trigger-run-{rule_id}"):
-                            TRIGGER_MANAGER.trigger_now(selected_agent.name, rule_id)
-                            st.success("Trigger fired.")
-                    with col_delete:
-                        if st.button("Delete", key=f"trigger-delete-{rule_id}"):
-                            agent_rules[:] = [r for r in agent_rules if r.get("id") != rule_id]
-                            if agent_rules:
-                                triggers_data[selected_agent.name] = agent_rules
+                            if item.get("streamlit_port"):
+                                url = f"http://localhost:{item['streamlit_port']}"
+                                st.link_button("Open Streamlit UI", url)
+                            if st.button(
+                                f"Stop {item['agent']} {item['label']}",
+                                key=f"stop-{item['pid']}",
+                            ):
+                                stopped, message = stop_item_process(item)
+                                if stopped:
+                                    HEALTH_MANAGER.mark_manual_stop(item["agent"], item["label"])
+                                    # Load fresh state and remove ONLY the stopped process
+                                    current_state = load_state()
+                                    current_state["processes"] = [
+                                        p for p in current_state.get("processes", [])
+                                        if p.get("pid") != item["pid"]
+                                    ]
+                                    save_state(current_state)
+                                    # Don't call refresh_state here - it may incorrectly
+                                    # remove other processes due to timing issues
+                                    st.success(message)
+                                    st.rerun()
+                                else:
+                                    st.error(message)
+                            if st.button(
+                                f"Restart {item['agent']} {item['label']}",
+                                key=f"restart-{item['pid']}",
+                            ):
+                                profiles = load_profiles().get(item["agent"], [])
+                                profile = next((p for p in profiles if p.label == item["label"]), None)
+                                if profile:
+                                    restarted = restart_profile_process(item["agent"], profile, Path(item["cwd"]))
+                                    if restarted:
+                                        state = load_health_state()
+                                        entry = state["profiles"].setdefault(
+                                            profile_key(item["agent"], item["label"]),
+                                            {"restart_count": 0},
+                                        )
+                                        entry["restart_count"] = int(entry.get("restart_count", 0)) + 1
+                                        entry["manual_stop"] = False
+                                        save_health_state(state)
+                                        st.success("Restarted.")
+                                        st.rerun()
+                                    else:
+                                        st.error("Restart failed. Check logs.")
+                            log_tail = tail_log_cached(log_path)
+                            if log_tail:
+                                st.text_area(
+                                    "Recent output",
+                                    value=log_tail,
+                                    height=220,
+                                    key=f"log-tail-{item['agent']}-{item['label']}-{item['pid']}",
+                                )
                             else:
-                                triggers_data.pop(selected_agent.name, None)
-                            save_triggers(triggers_data)
-                            st.rerun()
+                                st.markdown("No output yet.")
 
-        st.markdown("#### Add automation")
-        profiles = load_profiles().get(selected_agent.name, [])
-        profile_labels = [p.label for p in profiles]
-        if not profile_labels:
-            st.warning("Add run profiles before creating schedules or triggers.")
-        else:
-            # Automation type selector OUTSIDE form so it triggers re-render
-            rule_kind = st.selectbox("Automation type", ["Schedule", "Event"], key=f"rule-kind-{selected_agent.name}")
-
-            with st.form(f"add-trigger-{selected_agent.name}"):
-                label = st.text_input("Label", value="")
-                profile_choice = st.selectbox("Run profile", profile_labels)
-                enabled = st.checkbox("Enabled", value=True)
-                skip_if_running = st.checkbox("Skip if already running", value=True)
-
-                schedule_type = "hourly"
-                minute = 0
-                hour = 0
-                cron_expr = ""
-                event_type = "file_new"
-                folder_path = ""
-                pattern = "*"
-                recursive = False
-                secret = ""
-                secret_header = "X-Agentica-Token"
-
-                if rule_kind == "Schedule":
-                    schedule_type = st.selectbox(
-                        "Schedule type", ["hourly", "daily", "cron"]
-                    )
-                    if schedule_type == "hourly":
-                        minute = st.number_input("Minute", min_value=0, max_value=59, value=0)
-                    elif schedule_type == "daily":
-                        hour = st.number_input("Hour", min_value=0, max_value=23, value=9)
-                        minute = st.number_input("Minute", min_value=0, max_value=59, value=0)
-                    else:
-                        cron_expr = st.text_input("Cron (min hour day month weekday)", value="0 * * * *")
-                        st.caption("Weekday uses 0=Sunday..6=Saturday (7 also treated as Sunday).")
-                else:
-                    event_type = st.selectbox(
-                        "Event type", ["file_new", "file_change", "webhook", "github_push"]
-                    )
-                    if event_type in {"file_new", "file_change"}:
-                        folder_path = st.text_input("Folder path", value=str(selected_agent))
-                        pattern = st.text_input("Filename pattern", value="*")
-                        recursive = st.checkbox("Recursive", value=False)
-                    elif event_type == "webhook":
-                        secret = st.text_input("Webhook token (optional)", value="")
-                        secret_header = st.text_input(
-                            "Token header", value="X-Agentica-Token"
-                        )
-                    else:
-                        secret = st.text_input("GitHub webhook secret (optional)", value="")
-                submitted = st.form_submit_button("Create automation")
-
-            if submitted:
-                rule_id = uuid.uuid4().hex
-                rule_label = label.strip() or f"{rule_kind.lower()}-{rule_id[:8]}"
-                new_rule: dict[str, object] = {
-                    "id": rule_id,
-                    "label": rule_label,
-                    "profile_label": profile_choice,
-                    "kind": "schedule" if rule_kind == "Schedule" else "event",
-                    "enabled": enabled,
-                    "skip_if_running": skip_if_running,
-                }
-                if rule_kind == "Schedule":
-                    new_rule["schedule_type"] = schedule_type
-                    if schedule_type == "hourly":
-                        new_rule["minute"] = int(minute)
-                    elif schedule_type == "daily":
-                        new_rule["hour"] = int(hour)
-                        new_rule["minute"] = int(minute)
-                    else:
-                        new_rule["cron"] = cron_expr.strip()
-                else:
-                    new_rule["event_type"] = event_type
-                    if event_type in {"file_new", "file_change"}:
-                        new_rule["path"] = folder_path.strip()
-                        new_rule["pattern"] = pattern.strip() or "*"
-                        new_rule["recursive"] = bool(recursive)
-                    else:
-                        new_rule["webhook_path"] = f"/hook/{rule_id}"
-                        if secret:
-                            new_rule["secret"] = secret.strip()
-                        if event_type == "webhook":
-                            new_rule["secret_header"] = secret_header.strip() or "X-Agentica-Token"
-                triggers = load_triggers()
-                triggers.setdefault(selected_agent.name, [])
-                triggers[selected_agent.name].append(new_rule)
-                save_triggers(triggers)
-                st.success("Automation saved.")
-                st.rerun()
 
-        if TRIGGER_LOG_PATH.exists():
-            st.markdown("#### Automation log")
-            st.text_area(
-                "Recent scheduler output",
-                value=tail_log(TRIGGER_LOG_PATH, max_lines=120),
-                height=220,
-            )
-        st.markdown("</div>", unsafe_allow_html=True)
+    with automation_tab:
+        render_automation_panel(selected_agent)
 
     with marketplace_tab:
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown("#### Agent marketplace / registry")
+        with st.container(border=True):
+            st.markdown("#### Agent marketplace / registry")
 
-        metadata = load_metadata()
-        current_meta = metadata.get(selected_agent.name, {})
+            metadata = load_metadata()
+            current_meta = metadata.get(selected_agent.name, {})
 
-        version = st.text_input(
-            "Version",
-            value=current_meta.get("version", "0.1.0"),
-            key=f"meta-version-{selected_agent.name}",
-        )
-        tags_raw = st.text_input(
-            "Tags (comma-separated)",
-            value=", ".join(current_meta.get("tags", [])),
-            key=f"meta-tags-{selected_agent.name}",
-        )
-        description = st.text_area(
-            "Description",
-            value=current_meta.get("description", ""),
-            key=f"meta-desc-{selected_agent.name}",
-            height=100,
-        )
-        if st.button("Save metadata", key=f"save-meta-{selected_agent.name}"):
-            tags = [t.strip() for t in tags_raw.split(",") if t.strip()]
-            metadata[selected_agent.name] = {
-                "version": version.strip() or "0.1.0",
-                "tags": tags,
-                "description": description.strip(),
-            }
-            save_metadata(metadata)
-            st.success("Metadata saved.")
-
-        st.markdown("#### Export bundle")
-        if st.button("Build bundle", key=f"build-bundle-{selected_agent.name}"):
-            bundle_path = export_agent_bundle(selected_agent.name, selected_agent)
-            st.session_state[f"bundle-path-{selected_agent.name}"] = str(bundle_path)
-            st.success(f"Bundle created: {bundle_path.name}")
-
-        bundle_path_str = st.session_state.get(f"bundle-path-{selected_agent.name}")
-        if bundle_path_str:
-            bundle_path = Path(bundle_path_str)
-            if bundle_path.exists():
-                st.download_button(
-                    "Download bundle",
-                    data=bundle_path.read_bytes(),
-                    file_name=bundle_path.name,
-                    mime="application/zip",
-                    key=f"download-bundle-{selected_agent.name}",
-                )
-                if st.button("Publish to internal registry", key=f"publish-registry-{selected_agent.name}"):
-                    publish_to_registry(bundle_path)
-                    st.success("Published to internal registry.")
-                st.markdown("#### Publish to remote registry")
-                registry_url = st.text_input(
-                    "Registry endpoint",
-                    value="",
-                    key=f"registry-url-{selected_agent.name}",
-                    placeholder="https://registry.example.com",
-                )
-                registry_key = st.text_input(
-                    "Registry API key",
-                    value="",
-                    key=f"registry-key-{selected_agent.name}",
-                    type="password",
-                )
-                if st.button("Publish to remote", key=f"publish-remote-{selected_agent.name}"):
-                    ok, message = publish_to_remote_registry(bundle_path, registry_url, registry_key)
+            version = st.text_input(
+                "Version",
+                value=current_meta.get("version", "0.1.0"),
+                key=f"meta-version-{selected_agent.name}",
+            )
+            tags_raw = st.text_input(
+                "Tags (comma-separated)",
+                value=", ".join(current_meta.get("tags", [])),
+                key=f"meta-tags-{selected_agent.name}",
+            )
+            description = st.text_area(
+                "Description",
+                value=current_meta.get("description", ""),
+                key=f"meta-desc-{selected_agent.name}",
+                height=100,
+            )
+            if st.button("Save metadata", key=f"save-meta-{selected_agent.name}"):
+                tags = [t.strip() for t in tags_raw.split(",") if t.strip()]
+                metadata[selected_agent.name] = {
+                    "version": version.strip() or "0.1.0",
+                    "tags": tags,
+                    "description": description.strip(),
+                }
+                save_metadata(metadata)
+                st.success("Metadata saved.")
+
+            st.markdown("#### Export bundle")
+            if st.button("Build bundle", key=f"build-bundle-{selected_agent.name}"):
+                bundle_path = export_agent_bundle(selected_agent.name, selected_agent)
+                st.session_state[f"bundle-path-{selected_agent.name}"] = str(bundle_path)
+                st.success(f"Bundle created: {bundle_path.name}")
+
+            bundle_path_str = st.session_state.get(f"bundle-path-{selected_agent.name}")
+            if bundle_path_str:
+                bundle_path = Path(bundle_path_str)
+                if bundle_path.exists():
+                    st.download_button(
+                        "Download bundle",
+                        data=bundle_path.read_bytes(),
+                        file_name=bundle_path.name,
+                        mime="application/zip",
+                        key=f"download-bundle-{selected_agent.name}",
+                    )
+                    if st.button("Publish to internal registry", key=f"publish-registry-{selected_agent.name}"):
+                        publish_to_registry(bundle_path)
+                        st.success("Published to internal registry.")
+                    st.markdown("#### Publish to remote registry")
+                    registry_url = st.text_input(
+                        "Registry endpoint",
+                        value="",
+                        key=f"registry-url-{selected_agent.name}",
+                        placeholder="https://registry.example.com",
+                    )
+                    registry_key = st.text_input(
+                        "Registry API key",
+                        value="",
+                        key=f"registry-key-{selected_agent.name}",
+                        type="password",
+                    )
+                    if st.button("Publish to remote", key=f"publish-remote-{selected_agent.name}"):
+                        ok, message = publish_to_remote_registry(bundle_path, registry_url, registry_key)
+                        if ok:
+                            st.success(message)
+                        else:
+                            st.error(message)
+
+            st.markdown("#### Publish to GitHub")
+            repo_url = st.text_input("Repo URL", value="", key=f"repo-url-{selected_agent.name}")
+            branch = st.text_input("Branch", value="main", key=f"repo-branch-{selected_agent.name}")
+            if st.button("Publish", key=f"publish-github-{selected_agent.name}"):
+                if not repo_url.strip():
+                    st.error("Provide a repo URL.")
+                else:
+                    username = st.session_state.get("github-username")
+                    token = st.session_state.get("github-token")
+                    ok, message = publish_to_github_with_credentials(
+                        selected_agent,
+                        repo_url.strip(),
+                        branch.strip() or "main",
+                        username,
+                        token,
+                    )
                     if ok:
                         st.success(message)
                     else:
                         st.error(message)
 
-        st.markdown("#### Publish to GitHub")
-        repo_url = st.text_input("Repo URL", value="", key=f"repo-url-{selected_agent.name}")
-        branch = st.text_input("Branch", value="main", key=f"repo-branch-{selected_agent.name}")
-        if st.button("Publish", key=f"publish-github-{selected_agent.name}"):
-            if not repo_url.strip():
-                st.error("Provide a repo URL.")
-            else:
-                username = st.session_state.get("github-username")
-                token = st.session_state.get("github-token")
-                ok, message = publish_to_github_with_credentials(
-                    selected_agent,
-                    repo_url.strip(),
-                    branch.strip() or "main",
-                    username,
-                    token,
-                )
-                if ok:
-                    st.success(message)
-                else:
-                    st.error(message)
-
-        st.markdown("#### Import bundle")
-        uploaded = st.file_uploader("Agent bundle (.zip)", type=["zip"])
-        overwrite = st.checkbox("Overwrite if agent exists", value=False, key="import-overwrite")
-        if st.button("Import bundle"):
-            if not uploaded:
-                st.error("Upload a bundle first.")
-            else:
-                ok, message = import_agent_bundle(uploaded.getvalue(), overwrite)
-                if ok:
-                    st.success(message)
-                    st.rerun()
+            st.markdown("#### Import bundle")
+            uploaded = st.file_uploader("Agent bundle (.zip)", type=["zip"])
+            overwrite = st.checkbox("Overwrite if agent exists", value=False, key="import-overwrite")
+            if st.button("Import bundle"):
+                if not uploaded:
+                    st.error("Upload a bundle first.")
                 else:
-                    st.error(message)
-
-        st.markdown("#### Internal registry")
-        index = load_registry_index()
-        if not index.get("bundles"):
-            st.caption("No bundles published yet.")
-        else:
-            for item in index.get("bundles", []):
-                st.markdown(
-                    f"- **{item.get('name','')}** v{item.get('version','')} · "
-                    f"tags: {', '.join(item.get('tags', []))} · "
-                    f"bundle: `{item.get('bundle','')}`"
-                )
-        st.markdown("</div>", unsafe_allow_html=True)
-
-    with versioning_tab:
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown("#### Workspace versioning & rollback")
-
-        note = st.text_input("Snapshot note", value="")
-        if st.button("Create snapshot"):
-            snapshot_path = snapshot_agent(selected_agent.name, selected_agent, note)
-            st.success(f"Snapshot created: {snapshot_path.name}")
-
-        index = load_snapshot_index()
-        entries = index.get("agents", {}).get(selected_agent.name, [])
-        if not entries:
-            st.info("No snapshots yet.")
-        else:
-            entries_sorted = sorted(entries, key=lambda item: item.get("created_at", 0), reverse=True)
-            labels = [
-                f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(e.get('created_at', 0)))} · "
-                f"{e.get('version','')} · {e.get('note','') or 'no note'}"
-                for e in entries_sorted
-            ]
-            selection = st.selectbox("Snapshots", labels)
-            selected_idx = labels.index(selection)
-            snapshot_meta = entries_sorted[selected_idx]
-            snapshot_path = Path(snapshot_meta.get("path", ""))
-            if snapshot_path.exists():
-                st.markdown("#### Diff vs current")
-                snapshot = read_snapshot(snapshot_path)
-                diff_text = diff_snapshot_to_current(selected_agent, snapshot)
-                if diff_text:
-                    st.text_area("Unified diff", value=diff_text, height=320)
-                else:
-                    st.caption("No changes between snapshot and current.")
-                if st.button("Revert to snapshot"):
-                    ok, message = restore_snapshot(selected_agent.name, selected_agent, snapshot_path)
+                    ok, message = import_agent_bundle(uploaded.getvalue(), overwrite)
                     if ok:
                         st.success(message)
                         st.rerun()
                     else:
                         st.error(message)
+
+            st.markdown("#### Internal registry")
+            index = load_registry_index()
+            if not index.get("bundles"):
+                st.caption("No bundles published yet.")
             else:
-                st.error("Snapshot file missing.")
-        st.markdown("</div>", unsafe_allow_html=True)
+                for item in index.get("bundles", []):
+                    st.markdown(
+                        f"- **{item.get('name','')}** v{item.get('version','')} · "
+                        f"tags: {', '.join(item.get('tags', []))} · "
+                        f"bundle: `{item.get('bundle','')}`"
+                    )
+
+    with versioning_tab:
+        with st.container(border=True):
+            st.markdown("#### Workspace versioning & rollback")
+
+            note = st.text_input("Snapshot note", value="")
+            if st.button("Create snapshot"):
+                snapshot_path = snapshot_agent(selected_agent.name, selected_agent, note)
+                st.success(f"Snapshot created: {snapshot_path.name}")
+
+            index = load_snapshot_index()
+            entries = index.get("agents", {}).get(selected_agent.name, [])
+            if not entries:
+                st.info("No snapshots yet.")
+            else:
+                entries_sorted = sorted(entries, key=lambda item: item.get("created_at", 0), reverse=True)
+                labels = [
+                    f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(e.get('created_at', 0)))} · "
+                    f"{e.get('version','')} · {e.get('note','') or 'no note'}"
+                    for e in entries_sorted
+                ]
+                selection = st.selectbox("Snapshots", labels)
+                selected_idx = labels.index(selection)
+                snapshot_meta = entries_sorted[selected_idx]
+                snapshot_path = Path(snapshot_meta.get("path", ""))
+                if snapshot_path.exists():
+                    st.markdown("#### Diff vs current")
+                    ok, diff_text = diff_snapshot_to_current(selected_agent, snapshot_path)
+                    if not ok:
+                        st.error(diff_text)
+                    elif diff_text:
+                        st.text_area("Unified diff", value=diff_text, height=320)
+                    else:
+                        st.caption("No changes between snapshot and current.")
+                    if st.button("Revert to snapshot"):
+                        ok, message = restore_snapshot(selected_agent.name, selected_agent, snapshot_path)
+                        if ok:
+                            st.success(message)
+                            st.rerun()
+                        else:
+                            st.error(message)
+                else:
+                    st.error("Snapshot file missing.")